@@ -0,0 +1,86 @@
+"""Resaltado de filas: HighlightClassifier contra los "in message.lower()" por fila de antes.
+
+Uso: python benchmarks/bench_highlight.py [log] [--mb 300] [--rules highlight_rules.json]
+Sin log genera uno sintético (el de bench_parse.py). Sin --rules usa las reglas incorporadas más
+una variante con una subcadena no ASCII, que pasa por el camino decodificado.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import synclogs4
+from bench_parse import write_synthetic_log
+
+
+def per_row_categories(logs, rules):
+    # Lo que hacía la tabla original para cada fila visible, aquí para todas
+    needles = [[text.lower() for text in rule.get("match", [])] for rule in rules]
+    categories = np.zeros(len(logs), dtype=np.uint8)
+    for row in range(len(logs)):
+        lowered = logs.message(row).lower()
+        for code, texts in enumerate(needles, start=1):
+            if any(text in lowered for text in texts):
+                categories[row] = code
+                break
+    return categories
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("log", nargs="?")
+    parser.add_argument("--mb", type=int, default=300)
+    parser.add_argument("--rules")
+    args = parser.parse_args()
+
+    if args.rules:
+        with open(args.rules, "r", encoding="utf-8") as f:
+            rule_sets = {"custom": json.load(f)}
+    else:
+        rule_sets = {"built-in": synclogs4.DEFAULT_HIGHLIGHT_RULES,
+                     "non-ASCII": synclogs4.DEFAULT_HIGHLIGHT_RULES + [{"name": "fr", "match": ["ÉRREUR"]}]}
+    path = args.log
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        write_synthetic_log(path, args.mb)
+    try:
+        source = synclogs4.LogSource(path)
+        print(f"{path}: {len(source.data) / 1e6:.0f} MB")
+        for name, rules in rule_sets.items():
+            classifier = synclogs4.HighlightClassifier(rules)
+            logs = synclogs4.LogRecords(source, classifier)
+            start = time.perf_counter()
+            for chunk in synclogs4.iter_log_chunks(source, classifier, workers=1):
+                logs.extend(chunk)
+            parse_time = time.perf_counter() - start
+            # Lo que cuesta classify() dentro de ese parseo
+            classify_time = 0.0
+            for begin, end in synclogs4.log_chunk_ranges(source.data, synclogs4.PARSE_CHUNK_SIZE):
+                chunk = source.data[begin:end]
+                offsets = synclogs4.line_offsets(chunk)
+                starts, ends = synclogs4.line_bounds(chunk, offsets)
+                times, fast = synclogs4.decode_log_timestamps(chunk, starts, ends)
+                rows = np.flatnonzero(times != synclogs4.NO_TIMESTAMP)
+                msg_starts = synclogs4.message_offsets(chunk, starts[rows], ends[rows], fast[rows])
+                start = time.perf_counter()
+                classifier.classify(chunk, offsets, rows, msg_starts, ends[rows])
+                classify_time += time.perf_counter() - start
+            start = time.perf_counter()
+            reference = per_row_categories(logs, rules)
+            per_row_time = time.perf_counter() - start
+            same = np.array_equal(reference, logs.categories)
+            print(f"  {name:10s} parse {parse_time:6.2f} s (classify {classify_time:5.2f} s)   "
+                  f"per-row lower() {per_row_time:6.2f} s   {'same categories' if same else 'DIFFERENT CATEGORIES'}")
+        source.close()
+    finally:
+        if args.log is None:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
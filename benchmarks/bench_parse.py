@@ -0,0 +1,80 @@
+"""Parseo de un log grande: camino serie contra el pool de procesos (ajuste "parse_workers").
+
+Uso: python benchmarks/bench_parse.py [log] [--mb 512] [--workers 1 2 4 8]
+Sin log genera uno sintético de --mb MB. No usa la caché de índices. Comprueba que todos los
+caminos den las mismas columnas.
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import numpy as np
+import synclogs4
+
+
+def write_synthetic_log(path, mb, seed=0):
+    rng = random.Random(seed)
+    t = datetime.datetime(2026, 10, 16, 12, 0, 0)
+    categories = ["LogTemp", "LogNet", "LogOnline", "LogScript", "LogStreaming", "LogMemory", "LogWindows"]
+    levels = ["", "Warning: ", "Error: ", "Display: ", "Érreur: "]
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        while f.tell() < mb * 1024 * 1024:
+            lines = []
+            for _ in range(10000):
+                t += datetime.timedelta(milliseconds=rng.randrange(0, 40))
+                lines.append(f"[{t:%Y.%m.%d-%H.%M.%S}:{t.microsecond // 1000:03d}][{rng.randrange(1000):3d}]"
+                             f"{rng.choice(categories)}: {rng.choice(levels)}message {rng.randrange(10 ** 6)} "
+                             f"value={rng.random():.6f}")
+                if rng.random() < 0.02:
+                    lines.append("    at Foo::Bar() [C:/src/foo.cpp:123]")
+            f.write("\n".join(lines) + "\n")
+
+
+def parse(source, workers):
+    """Columnas concatenadas de todos los chunks (sin caché)."""
+    parts = list(synclogs4.iter_log_chunks(source, synclogs4.HIGHLIGHTER, workers))
+    return [np.concatenate([part[i] for part in parts]) for i in range(1, 5)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("log", nargs="?")
+    parser.add_argument("--mb", type=int, default=512)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    path = args.log
+    if path is None:
+        fd, path = tempfile.mkstemp(suffix=".log")
+        os.close(fd)
+        write_synthetic_log(path, args.mb)
+    try:
+        source = synclogs4.LogSource(path)
+        print(f"{path}: {len(source.data) / 1e6:.0f} MB, {os.cpu_count()} cores, "
+              f"pool from {synclogs4.PARSE_PARALLEL_MIN // (1024 * 1024)} MB")
+        reference = None
+        for workers in dict.fromkeys(args.workers):
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                columns = parse(source, workers)
+                best = min(best, time.perf_counter() - start)
+            if reference is None:
+                reference = columns
+            same = all(np.array_equal(a, b) for a, b in zip(reference, columns))
+            print(f"  workers={workers:<3d} {best:6.2f} s  {len(source.data) / 1e6 / best:6.0f} MB/s"
+                  f"{'' if same else '  DIFFERENT RESULT'}")
+        source.close()
+    finally:
+        if args.log is None:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,200 +1,3264 @@
 import sys
 import re
+import bisect
 import os
 import cv2
 import datetime
-import bisect
-from PySide6.QtCore import QTimer, Qt, QPoint, QSize
+import mmap
+import multiprocessing
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PySide6.QtCore import QTimer, Qt, QPoint, QRect, QSize, QAbstractTableModel, QAbstractProxyModel, QModelIndex, QObject, QThread, Signal
 from PySide6.QtWidgets import (
     QApplication, QLabel, QSplitter, QWidget, 
-    QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QSizePolicy, QFileDialog,
-    QTableView, QHeaderView, QAbstractItemView, QFrame, QSpacerItem, QMenuBar, QMenu, QMainWindow, QDialog, QProgressBar, QMessageBox
+    QVBoxLayout, QHBoxLayout, QGridLayout, QPushButton, QSlider, QSizePolicy, QFileDialog,
+    QTableView, QHeaderView, QAbstractItemView, QFrame, QSpacerItem, QMenuBar, QMenu, QMainWindow, QDialog, QProgressBar, QMessageBox, QStyle,
+    QLineEdit, QCheckBox, QInputDialog
 )
-from PySide6.QtGui import QImage, QPixmap, QStandardItemModel, QStandardItem, QColor, QFont, QIcon, QAction
+from PySide6.QtGui import QImage, QPixmap, QPainter, QColor, QFont, QFontMetrics, QIcon, QAction, QShortcut, QKeySequence
 import qdarktheme
-import zipfile, json, tempfile, subprocess, pathlib
+import zipfile, json, tempfile, subprocess, pathlib, hashlib, shutil
+
+from pyupdater.client import Client
+import requests
+
+class AppClient(Client):
+    APP_NAME = "Synclogs"
+    COMPANY_NAME = "KovaTools"
+    HTTP_TIMEOUT = 30
+    MAX_DOWNLOAD_RETRIES = 3
+    
+def check_for_update(current_version: str):
+    try:
+        url = "https://api.github.com/repos/gamartin23/Lupi/releases/latest"
+        resp = requests.get(url, timeout=5).json()
+        
+        latest_version = resp["tag_name"].lstrip("v")
+        assets = resp.get("assets", [])
+        
+        from packaging import version
+        if version.parse(latest_version) > version.parse(current_version):
+            if assets:
+                download_url = assets[0]["browser_download_url"]
+                return latest_version, download_url
+        return None, None
+    except Exception as e:
+        print("Error checking updates:", e)
+        return None, None
+
+LOG_PATH = ''
+VIDEO_PATH = ''
+
+def resource_path(relative_path):
+    if hasattr(sys, "_MEIPASS"):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.abspath(".")
+    return os.path.join(base_path, relative_path)
+
+LOG_ICON_PATH = resource_path("img/logs.png")  
+VIDEO_ICON_PATH = resource_path("img/video.png")
+PLAY_ICON_PATH = resource_path("img/play.png") 
+PAUSE_ICON_PATH = resource_path("img/pause.png")
+RESTART_ICON_PATH = resource_path("img/restart.png")
+END_ICON_PATH = resource_path("img/end.png")
+PLUS2_ICON_PATH = resource_path("img/plus2.png")
+MINUS2_ICON_PATH = resource_path("img/minus2.png")
+ONEX_ICON_PATH = resource_path("img/1x.png")
+HALFX_ICON_PATH = resource_path("img/point5.png")
+POINT2X_ICON_PATH = resource_path("img/point2.png")
+APPICON = resource_path("img/synclogs128.ico")
+FFMPEG_PATH = "ffmpeg_binaries/bin/ffmpeg"
+FFPROBE_PATH = "ffmpeg_binaries/bin/ffprobe"
+NO_WINDOW_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)  # solo existe en Windows
+ver = "1.7"
+
+CONFIG_DIR = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "Lupi")
+SETTINGS_PATH = os.path.join(CONFIG_DIR, "settings.json")
+DEFAULT_SETTINGS = {
+    "parse_workers": 1,  # procesos para parsear logs grandes; 1 = sin pool, 0 = uno por núcleo (medir con benchmarks/bench_parse.py)
+    "index_cache_mb": 2048,  # tope de la caché de índices de logs; 0 = desactivada
+    "frame_cache_mb": 256,  # frames ya decodificados y escalados que se guardan en memoria; 0 = sin caché
+    "video_decoder": "auto",  # reproducción: "opencv", "ffmpeg" (escala en ffmpeg) o "auto" (ffmpeg para videos > 1080p)
+    "export_margin_seconds": 30,  # al recortar el export a lo que cubren los logs, video extra a cada lado
+}
+
+def load_settings():
+    settings = dict(DEFAULT_SETTINGS)
+    try:
+        with open(SETTINGS_PATH, "r", encoding="utf-8") as f:
+            settings.update(json.load(f))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as e:
+        print("Error reading settings:", e)
+    return settings
+
+SETTINGS = load_settings()
+
+if os.environ.get("LOCALAPPDATA"):
+    CACHE_DIR = os.path.join(os.environ["LOCALAPPDATA"], "Lupi", "cache")
+else:
+    CACHE_DIR = os.path.join(CONFIG_DIR, "cache")
+
+
+# ------------------- UTILIDADES -------------------
+
+def get_file_creation_time_utc(path):
+    ts = os.path.getctime(path)
+    return datetime.datetime.utcfromtimestamp(ts)
+
+# Prefijo UE5 "[YYYY.MM.DD-HH.MM.SS:mmm]" (25 bytes) al inicio de la línea
+LOG_TS_PATTERN = re.compile(r"\[(\d{4}\.\d{2}\.\d{2})-(\d{2}\.\d{2}\.\d{2}):(\d+)\]")
+LOG_TS_PREFIX_LEN = 25
+LOG_TS_MIN_LEN = 23  # "[YYYY.MM.DD-HH.MM.SS:m]"
+NO_TIMESTAMP = np.iinfo(np.int64).min
+EPOCH = datetime.datetime(1970, 1, 1)
+_TS_DECODE_BATCH = 1 << 20
+_TS_SEPARATORS = {0: b"[", 5: b".", 8: b".", 11: b"-", 14: b".", 17: b".", 20: b":", 24: b"]"}
+_TS_FIELDS = ((1, 4), (6, 2), (9, 2), (12, 2), (15, 2), (18, 2), (21, 3))  # (columna, dígitos)
+_DAYS_IN_MONTH = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+# Lo que el viejo re.sub quitaba del inicio del mensaje (más los espacios de strip())
+_MSG_START_PATTERN = re.compile(rb"\s*(?:\[\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}:\d+\]\s*)?")
+_WHITESPACE = np.frombuffer(b" \t\n\r\x0b\x0c", dtype=np.uint8)
+
+VIDEO_RANGE_COLORS = ("#161600", "#DCD69F")  # oscuro amarillento / amarillo claro
+
+# Reglas de resaltado: la primera que coincide gana. "match" son subcadenas (sin distinguir
+# mayúsculas), "regex" patrones opcionales. Se pueden reemplazar con highlight_rules.json.
+HIGHLIGHT_RULES_PATH = os.path.join(CONFIG_DIR, "highlight_rules.json")
+DEFAULT_HIGHLIGHT_RULES = [
+    {"name": "crash", "match": ["unhandled exception", "callstack", "logwindows: error"],
+     "background": "#2b0000", "foreground": "#ff9999"},  # rojo muy oscuro / rojo claro
+    {"name": "exit", "match": ["win requestexit"], "background": "#000316", "foreground": "#9FD8DC"},
+    {"name": "memory", "match": ["logmemory"], "background": "#000F16", "foreground": "#9FDCD4"},
+]
+
+class HighlightClassifier:
+    """Reglas de resaltado compiladas. classify() corre una vez por chunk al parsear y deja un
+    código por fila (0 = sin regla, n = regla n-ésima).
+
+    Las subcadenas se buscan con bytes.find sobre el chunk en minúsculas, que es mucho más
+    rápido que una alternancia de re; solo las reglas "regex" pasan por re. bytes.lower() y re sobre
+    bytes solo ignoran mayúsculas ASCII: las subcadenas y regex con otros caracteres se buscan en el
+    chunk decodificado (más lento, solo si hay reglas así).
+    """
+
+    NO_MATCH = 255
+    MATCHING_VERSION = 2  # entra en key: cambiarlo invalida las categorías ya cacheadas
+
+    def __init__(self, rules):
+        if len(rules) >= self.NO_MATCH:
+            raise ValueError(f"Too many highlight rules ({len(rules)})")
+        self.rules = rules
+        self.needles = []
+        self.text_needles = []
+        self.group_codes = {}
+        regex_parts = []
+        text_regex_parts = []
+        for code, rule in enumerate(rules, start=1):
+            for text in rule.get("match", []):
+                if text.isascii():
+                    self.needles.append((text.lower().encode("utf-8"), code))
+                else:
+                    self.text_needles.append((text.lower(), code))
+            for i, pattern in enumerate(rule.get("regex", [])):
+                group = f"rule{code}_{i}"
+                self.group_codes[group] = code
+                (regex_parts if pattern.isascii() else text_regex_parts).append(f"(?P<{group}>{pattern})")
+        self.regex = re.compile("|".join(regex_parts).encode("utf-8"), re.IGNORECASE) if regex_parts else None
+        self.text_regex = re.compile("|".join(text_regex_parts), re.IGNORECASE) if text_regex_parts else None
+        self.colors = {code: (rule.get("background"), rule.get("foreground"))
+                       for code, rule in enumerate(rules, start=1)}
+        self.key = hashlib.sha1(json.dumps([self.MATCHING_VERSION, rules], sort_keys=True).encode("utf-8")).hexdigest()
+
+    def classify(self, data, offsets, rows, msg_starts, ends):
+        """Código de cada fila (rows: índices de línea en offsets) mirando solo su mensaje."""
+        categories = np.zeros(len(rows), dtype=np.uint8)
+        if not len(rows):
+            return categories
+        starts, stops, codes = [], [], []
+        if self.needles:
+            lowered = bytes(data).lower()
+            for needle, code in self.needles:
+                pos = lowered.find(needle)
+                while pos >= 0:
+                    starts.append(pos)
+                    stops.append(pos + len(needle))
+                    codes.append(code)
+                    pos = lowered.find(needle, pos + 1)
+        if self.regex:
+            for match in self.regex.finditer(data):
+                starts.append(match.start())
+                stops.append(match.end())
+                codes.append(self.group_codes[match.lastgroup])
+        if self.text_needles or self.text_regex:
+            self._classify_text(data, offsets, rows, msg_starts, ends, starts, stops, codes)
+        if not starts:
+            return categories
+
+        starts = np.array(starts, dtype=np.int64)
+        stops = np.array(stops, dtype=np.int64)
+        codes = np.array(codes, dtype=np.uint8)
+        lines = np.searchsorted(offsets, starts, side="right") - 1
+        idx = np.minimum(np.searchsorted(rows, lines), len(rows) - 1)
+        keep = (rows[idx] == lines) & (starts >= msg_starts[idx]) & (stops <= ends[idx])
+        best = np.full(len(rows), self.NO_MATCH, dtype=np.uint8)
+        np.minimum.at(best, idx[keep], codes[keep])
+        categories[best != self.NO_MATCH] = best[best != self.NO_MATCH]
+        return categories
+
+    def _classify_text(self, data, offsets, rows, msg_starts, ends, starts, stops, codes):
+        # Coincidencias de las reglas no ASCII como rangos vacíos al inicio de su línea o mensaje: a
+        # classify() solo le importa en qué fila caen y que no empiecen en el prefijo de timestamp.
+        buf = np.frombuffer(data, dtype=np.uint8)
+        if self.text_needles:
+            # Una subcadena con no-ASCII en minúsculas solo puede estar en un mensaje con bytes no ASCII
+            lines = np.unique(np.searchsorted(offsets, np.flatnonzero(buf >= 0x80), side="right") - 1)
+            for i in np.flatnonzero(np.isin(rows, lines)).tolist():
+                message = bytes(data[msg_starts[i]:ends[i]]).decode("utf-8", errors="ignore").lower()
+                for needle, code in self.text_needles:
+                    if needle in message:
+                        starts.append(int(msg_starts[i]))
+                        stops.append(int(msg_starts[i]))
+                        codes.append(code)
+        if self.text_regex:
+            # Sobre el texto decodificado: la columna en caracteres no es la de bytes si antes hay
+            # no-ASCII, pero el prefijo de timestamp es ASCII, así que sirve para compararla con msg_starts
+            text = bytes(data).decode("utf-8", errors="ignore")
+            line = 0
+            line_start = 0
+            for match in self.text_regex.finditer(text):
+                pos = match.start()
+                if "\n" in match.group():
+                    continue
+                line += text.count("\n", line_start, pos)
+                line_start = text.rfind("\n", 0, pos) + 1
+                starts.append(int(offsets[line]) + pos - line_start)
+                stops.append(starts[-1])
+                codes.append(self.group_codes[match.lastgroup])
+
+def load_highlight_rules():
+    try:
+        with open(HIGHLIGHT_RULES_PATH, "r", encoding="utf-8") as f:
+            return HighlightClassifier(json.load(f))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, TypeError, AttributeError, re.error) as e:
+        print("Error reading highlight rules:", e)
+    return HighlightClassifier(DEFAULT_HIGHLIGHT_RULES)
+
+HIGHLIGHTER = load_highlight_rules()
+
+def datetime_to_ms(dt):
+    return (dt - EPOCH) // datetime.timedelta(milliseconds=1)
+
+def ms_to_datetime(ms):
+    return EPOCH + datetime.timedelta(milliseconds=int(ms))
+
+def parse_log_timestamp(line):
+    """Camino lento: mismo regex + strptime de siempre. Devuelve datetime o None."""
+    match = LOG_TS_PATTERN.search(line)
+    if not match:
+        return None
+    date_str = match.group(1).replace(".", "-")
+    time_str = match.group(2).replace(".", ":")
+    ms_str = match.group(3)
+    return datetime.datetime.strptime(
+        f"{date_str} {time_str}.{ms_str}",
+        "%Y-%m-%d %H:%M:%S.%f"
+    )
+
+def line_offsets(data):
+    """Offsets de inicio de cada línea más el final del buffer (n + 1 valores int64)."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == 0x0A)
+    offsets = np.empty(len(newlines) + 2, dtype=np.int64)
+    offsets[0] = 0
+    offsets[1:-1] = newlines + 1
+    offsets[-1] = len(buf)
+    if len(newlines) and newlines[-1] == len(buf) - 1 or not len(buf):
+        offsets = offsets[:-1]
+    return offsets
+
+def log_chunk_ranges(data, chunk_size, start=0, stop=None):
+    """Parte data[start:stop] en rangos (start, end) de ~chunk_size bytes alineados a fin de línea."""
+    stop = len(data) if stop is None else stop
+    ranges = []
+    while start < stop:
+        end = data.find(b"\n", min(start + chunk_size, stop) - 1, stop)
+        end = stop if end < 0 else end + 1
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+def line_bounds(data, offsets):
+    """(starts, ends) de cada línea; ends excluye el "\n" y el "\r" final."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts = offsets[:-1]
+    ends = offsets[1:].copy()
+    nl = ends > starts
+    nl[nl] = buf[ends[nl] - 1] == 0x0A
+    ends[nl] -= 1
+    cr = ends > starts
+    cr[cr] = buf[ends[cr] - 1] == 0x0D
+    ends[cr] -= 1
+    return starts, ends
+
+def _decode_fixed_prefixes(buf, starts):
+    # Decodifica en bloque los prefijos de ancho fijo; las líneas que no encajan quedan en NO_TIMESTAMP
+    ok = np.ones(len(starts), dtype=bool)
+    for col, sep in _TS_SEPARATORS.items():
+        ok &= buf[starts + col] == sep[0]
+    fields = []
+    for col, width in _TS_FIELDS:
+        value = np.zeros(len(starts), dtype=np.int64)
+        for k in range(width):
+            digit = buf[starts + col + k].astype(np.int64) - 0x30
+            ok &= (digit >= 0) & (digit <= 9)
+            value = value * 10 + digit
+        fields.append(value)
+    year, month, day, hour, minute, second, millis = fields
+
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    ok &= (year >= 1) & (month >= 1) & (month <= 12)
+    month_days = _DAYS_IN_MONTH[np.where(ok, month, 0)] + ((month == 2) & leap)
+    ok &= (day >= 1) & (day <= month_days) & (hour <= 23) & (minute <= 59) & (second <= 59)
+
+    # days_from_civil (proléptico gregoriano, igual que datetime)
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    days = era * 146097 + doe - 719468
+    ms = (((days * 24 + hour) * 60 + minute) * 60 + second) * 1000 + millis
+    return np.where(ok, ms, NO_TIMESTAMP)
+
+def decode_log_timestamps(data, starts, ends):
+    """(times, fast): ms epoch de cada línea (NO_TIMESTAMP si no tiene) y máscara de prefijo UE5 al inicio.
+
+    Las líneas con el prefijo UE5 al inicio se decodifican vectorizadas con NumPy; el resto
+    pasa por parse_log_timestamp para dar exactamente el mismo resultado que strptime
+    (con más de 3 dígitos de ms se trunca al milisegundo).
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    times = np.full(len(starts), NO_TIMESTAMP, dtype=np.int64)
+    fixed = np.flatnonzero(ends - starts >= LOG_TS_PREFIX_LEN)
+    for i in range(0, len(fixed), _TS_DECODE_BATCH):
+        rows = fixed[i:i + _TS_DECODE_BATCH]
+        times[rows] = _decode_fixed_prefixes(buf, starts[rows])
+
+    fast = times != NO_TIMESTAMP
+    irregular = np.flatnonzero(~fast & (ends - starts >= LOG_TS_MIN_LEN))
+    for row in irregular.tolist():
+        raw = data[starts[row]:ends[row]]
+        if b"[" not in raw:
+            continue
+        log_time = parse_log_timestamp(raw.decode("utf-8", errors="ignore"))
+        if log_time is not None:
+            times[row] = datetime_to_ms(log_time)
+    return times, fast
+
+def message_offsets(data, starts, ends, fast):
+    """Offset donde empieza el mensaje de cada línea, sin el prefijo de timestamp ni espacios."""
+    buf = np.frombuffer(data, dtype=np.uint8)
+    msg_starts = np.where(fast, starts + LOG_TS_PREFIX_LEN, starts)
+    for row in np.flatnonzero(~fast).tolist():
+        msg_starts[row] = _MSG_START_PATTERN.match(data, starts[row], ends[row]).end()
+    pending = np.flatnonzero(fast & (msg_starts < ends))
+    while len(pending):
+        pending = pending[np.isin(buf[msg_starts[pending]], _WHITESPACE)]
+        msg_starts[pending] += 1
+        pending = pending[msg_starts[pending] < ends[pending]]
+    return msg_starts
+
+def append_to_buffer(buffer, size, values):
+    """Copia values en buffer[size:], duplicando la capacidad si hace falta. Devuelve el buffer.
+
+    Los buffers de solo lectura (memmaps de la caché) se copian antes de escribir."""
+    needed = size + len(values)
+    if needed > len(buffer) or not buffer.flags.writeable:
+        grown = np.empty(max(needed, 2 * len(buffer), 1024), dtype=buffer.dtype)
+        grown[:size] = buffer[:size]
+        buffer = grown
+    buffer[size:needed] = values
+    return buffer
+
+class LogSource:
+    """Texto del log abierto con mmap. Solo guarda offsets de línea; se decodifica bajo demanda."""
+
+    COPY_CHUNK = 16 * 1024 * 1024
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(path, "rb")
+        if os.fstat(self._file.fileno()).st_size:
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = b""
+        self._head = self.data[:4096]
+        # Inicio de cada línea indexada + fin de la última (hasta dónde se parseó)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self.offsets = self._offsets
+
+    def set_offsets(self, offsets):
+        self._offsets = offsets
+        self.offsets = offsets
+
+    def append_lines(self, offsets):
+        """offsets: inicios de las líneas nuevas seguidos del fin de la última (como devuelve scan_log_chunk)."""
+        count = len(self)
+        self._offsets = append_to_buffer(self._offsets, count, offsets)
+        self.offsets = self._offsets[:count + len(offsets)]
+
+    def drop_last_line(self):
+        self.offsets = self._offsets[:len(self.offsets) - 1]
+
+    def has_partial_tail(self):
+        """True si la última línea indexada no termina en "\n" (puede seguir escribiéndose)."""
+        end = self.offsets[-1]
+        return len(self) > 0 and self.data[end - 1] != 0x0A
+
+    def refresh(self):
+        """Vuelve a mapear el archivo si creció. Devuelve "grown", "rotated" o None si no cambió."""
+        try:
+            current = os.stat(self.path)
+        except OSError:
+            return None  # puede faltar un momento mientras se rota
+        own = os.fstat(self._file.fileno())
+        if (current.st_ino, current.st_dev) != (own.st_ino, own.st_dev) or own.st_size < len(self.data):
+            return "rotated"
+        if own.st_size == len(self.data):
+            return None
+        old = self.data
+        self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if isinstance(old, mmap.mmap):
+            try:
+                old.close()
+            except BufferError:
+                pass  # todavía hay vistas vivas; se libera con el GC
+        if self.data[:len(self._head)] != self._head:
+            return "rotated"
+        return "grown"
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def line_end(self, index):
+        end = self.offsets[index + 1]
+        if end > self.offsets[index] and self.data[end - 1] == 0x0A:
+            end -= 1
+        if end > self.offsets[index] and self.data[end - 1] == 0x0D:
+            end -= 1
+        return end
+
+    def raw_line(self, index):
+        return self.data[self.offsets[index]:self.line_end(index)]
+
+    def line(self, index):
+        return self.raw_line(index).decode("utf-8", errors="ignore")
+
+    def __getitem__(self, index):
+        return self.line(index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.line(index)
+
+    def write_to(self, f):
+        for pos in range(0, len(self.data), self.COPY_CHUNK):
+            f.write(self.data[pos:pos + self.COPY_CHUNK])
+
+    def close(self):
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                pass
+        self._file.close()
+
+class LogRecords:
+    """Líneas con timestamp en columnas sobre el texto de un LogSource.
+
+    times: ms epoch, msg_starts: offset del mensaje ya sin prefijo, categories: código de
+    regla de classifier, line_nos: número de línea original en source.
+    """
+
+    COLUMNS = (("times", np.int64), ("msg_starts", np.int64), ("categories", np.uint8), ("line_nos", np.int64))
+
+    def __init__(self, source, classifier):
+        self.source = source
+        self.classifier = classifier
+        self._size = 0
+        self._buffers = {}
+        for name, dtype in self.COLUMNS:
+            self._buffers[name] = np.empty(0, dtype=dtype)
+            setattr(self, name, self._buffers[name])
+
+    def adopt_index(self, index):
+        """Toma las columnas de un índice ya calculado (ver load_log_index) sin copiarlas."""
+        self.source.set_offsets(index["offsets"])
+        for name, _ in self.COLUMNS:
+            self._buffers[name] = index[name]
+            setattr(self, name, index[name])
+        self._size = len(index["times"])
+
+    def extend(self, chunk):
+        """Añade un resultado de scan_log_chunk (filas locales al chunk) al final."""
+        offsets, rows, times, msg_starts, categories = chunk
+        values = {"times": times, "msg_starts": msg_starts, "categories": categories,
+                  "line_nos": rows + len(self.source)}
+        self.source.append_lines(offsets)
+        for name, _ in self.COLUMNS:
+            self._buffers[name] = append_to_buffer(self._buffers[name], self._size, values[name])
+        self._size += len(times)
+        self._update_views()
+
+    def drop_last_line(self):
+        """Quita la última línea del source (y su fila si tenía timestamp). Devuelve True si quitó una fila."""
+        dropped = self._size > 0 and self.line_nos[-1] == len(self.source) - 1
+        if dropped:
+            self._size -= 1
+            self._update_views()
+        self.source.drop_last_line()
+        return dropped
+
+    def _update_views(self):
+        for name, _ in self.COLUMNS:
+            setattr(self, name, self._buffers[name][:self._size])
+
+    def __len__(self):
+        return len(self.times)
+
+    def timestamp(self, row):
+        return ms_to_datetime(self.times[row])
+
+    def message(self, row):
+        end = self.source.line_end(self.line_nos[row])
+        return self.source.data[self.msg_starts[row]:end].decode("utf-8", errors="ignore").strip()
+
+    def continuation_span(self, row):
+        """Líneas sin timestamp que siguen a la fila (callstacks, mensajes multilínea): rango [first, end) en source."""
+        first = int(self.line_nos[row]) + 1
+        end = int(self.line_nos[row + 1]) if row + 1 < len(self) else len(self.source)
+        return first, end
+
+    def continuation_line(self, row, subline):
+        return self.source.line(int(self.line_nos[row]) + subline)
+
+    def row_at_time(self, ms):
+        """Última fila con timestamp <= ms (-1 si no hay)."""
+        return int(np.searchsorted(self.times, ms, side="right")) - 1
+
+PARSE_CHUNK_SIZE = 32 * 1024 * 1024
+PARSE_PARALLEL_MIN = 128 * 1024 * 1024  # por debajo no compensa levantar el pool
+
+def scan_log_chunk(data, start, end, classifier):
+    """Parsea data[start:end]: offsets absolutos de línea (más el fin del chunk), y por cada
+    línea con timestamp su fila local, ms, inicio del mensaje y categoría."""
+    chunk = data[start:end]
+    offsets = line_offsets(chunk)
+    starts, ends = line_bounds(chunk, offsets)
+    line_times, fast = decode_log_timestamps(chunk, starts, ends)
+    rows = np.flatnonzero(line_times != NO_TIMESTAMP)
+    msg_starts = message_offsets(chunk, starts[rows], ends[rows], fast[rows])
+    categories = classifier.classify(chunk, offsets, rows, msg_starts, ends[rows])
+    return offsets + start, rows, line_times[rows], msg_starts + start, categories
+
+def _scan_log_chunk_file(path, start, end, classifier):
+    # Corre en el pool: cada proceso abre su propio mmap
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        return scan_log_chunk(data, start, end, classifier)
+
+def parse_workers():
+    workers = int(SETTINGS.get("parse_workers") or 0)
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+def iter_log_chunks(source, classifier, workers=None):
+    """Resultados de scan_log_chunk en orden de archivo, en paralelo si el log es grande."""
+    workers = parse_workers() if workers is None else workers
+    ranges = log_chunk_ranges(source.data, PARSE_CHUNK_SIZE)
+    if workers <= 1 or len(ranges) <= 1 or len(source.data) < PARSE_PARALLEL_MIN:
+        for start, end in ranges:
+            yield scan_log_chunk(source.data, start, end, classifier)
+        return
+    starts, ends = zip(*ranges)
+    pool = ProcessPoolExecutor(max_workers=min(workers, len(ranges)))
+    try:
+        yield from pool.map(_scan_log_chunk_file, [source.path] * len(ranges), starts, ends,
+                            [classifier] * len(ranges))
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+def load_log_records(logs, workers=None, cancelled=None, progress=None):
+    """Completa un LogRecords vacío desde la caché o parseándolo. Devuelve False si cancelled() cortó el trabajo."""
+    index = INDEX_CACHE.lookup(logs.source, logs.classifier)
+    if index is not None:
+        logs.adopt_index(index)
+        return True
+    size = max(1, len(logs.source.data))
+    writer = INDEX_CACHE.writer(logs.source, logs.classifier)
+    chunks = iter_log_chunks(logs.source, logs.classifier, workers)
+    completed = False
+    try:
+        for chunk in chunks:
+            if cancelled and cancelled():
+                return False
+            logs.extend(chunk)
+            writer.add_chunk(chunk)
+            if progress:
+                progress(int(100 * chunk[0][-1] / size))
+        completed = True
+    finally:
+        chunks.close()
+        if completed:
+            writer.commit()
+        else:
+            writer.abort()
+    return True
+
+def parse_logs(log_file, workers=None, classifier=None):
+    """Abre el log con mmap y devuelve sus LogRecords ya completos (de la caché si se puede)."""
+    logs = LogRecords(LogSource(log_file), classifier or HIGHLIGHTER)
+    load_log_records(logs, workers)
+    return logs
+
+def log_time_range(log_file, probe=4 * 1024 * 1024):
+    """(primer, último) timestamp en ms leyendo solo el principio y el final del log; None si no hay."""
+    with open(log_file, "rb") as f:
+        head = f.read(probe)
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - probe))
+        tail = f.read()
+    if size > probe:
+        tail = tail[tail.find(b"\n") + 1:]  # descartar la línea cortada
+    found = []
+    for data in (head, tail):
+        times, _ = decode_log_timestamps(data, *line_bounds(data, line_offsets(data)))
+        found.append(times[times != NO_TIMESTAMP])
+    if not len(found[0]) or not len(found[1]):
+        return None
+    return int(found[0][0]), int(found[1][-1])
+
+# ------------------- CACHÉ DE ÍNDICES -------------------
+
+INDEX_VERSION = 1
+INDEX_COLUMNS = (("offsets", np.int64),) + LogRecords.COLUMNS
+
+def load_log_index(directory):
+    """Columnas de un índice escrito por LogIndexWriter, mapeadas en memoria (solo lectura)."""
+    with open(os.path.join(directory, "meta.json"), "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    if meta.get("version") != INDEX_VERSION:
+        raise ValueError(f"Unsupported log index version {meta.get('version')}")
+    index = {"meta": meta}
+    for name, dtype in INDEX_COLUMNS:
+        path = os.path.join(directory, name + ".bin")
+        if os.path.getsize(path):
+            index[name] = np.memmap(path, dtype=dtype, mode="r")
+        else:
+            index[name] = np.empty(0, dtype=dtype)
+    if len(index["offsets"]) != meta["lines"] + 1 or len(index["times"]) != meta["rows"]:
+        raise ValueError("Truncated log index")
+    return index
+
+class LogIndexWriter:
+    """Escribe las columnas de un log chunk a chunk en <directory>.tmp y lo renombra al terminar.
+
+    Con directory=None no hace nada (caché desactivada)."""
+
+    def __init__(self, directory, data_len, meta=None):
+        self.directory = directory
+        self.data_len = data_len
+        self.meta = dict(meta or {})
+        self.lines = 0
+        self.rows = 0
+        self.end = 0
+        self.files = {}
+        if directory is None:
+            return
+        self.tmp = directory + ".tmp"
+        try:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+            os.makedirs(self.tmp)
+            self.files = {name: open(os.path.join(self.tmp, name + ".bin"), "wb") for name, _ in INDEX_COLUMNS}
+        except OSError as e:
+            print("Error creating log index:", e)
+            self.abort()
+
+    def add_chunk(self, chunk):
+        if not self.files:
+            return
+        offsets, rows, times, msg_starts, categories = chunk
+        line_starts = offsets[:-1]
+        try:
+            self.files["offsets"].write(np.ascontiguousarray(line_starts, dtype=np.int64).tobytes())
+            self.files["times"].write(np.ascontiguousarray(times, dtype=np.int64).tobytes())
+            self.files["msg_starts"].write(np.ascontiguousarray(msg_starts, dtype=np.int64).tobytes())
+            self.files["categories"].write(np.ascontiguousarray(categories, dtype=np.uint8).tobytes())
+            self.files["line_nos"].write((rows + self.lines).astype(np.int64).tobytes())
+        except OSError as e:
+            print("Error writing log index:", e)
+            self.abort()
+            return
+        self.lines += len(line_starts)
+        self.rows += len(times)
+        self.end = int(offsets[-1])
+
+    def commit(self):
+        if not self.files:
+            return False
+        try:
+            self.files["offsets"].write(np.array([self.end], dtype=np.int64).tobytes())
+            for f in self.files.values():
+                f.close()
+            self.files = {}
+            meta = dict(self.meta, version=INDEX_VERSION, lines=self.lines, rows=self.rows, size=self.data_len)
+            with open(os.path.join(self.tmp, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.replace(self.tmp, self.directory)
+            return True
+        except OSError as e:
+            print("Error saving log index:", e)
+            self.abort()
+            return False
+
+    def abort(self):
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        if self.directory is not None:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+
+class LogIndexCache:
+    """Índices de logs ya parseados, uno por directorio en CACHE_DIR/index.
+
+    La clave combina ruta, tamaño, mtime, un hash del principio y el final del archivo y las
+    reglas de resaltado: si el log cambia, la entrada deja de coincidir y se reemplaza.
+    Se expulsan las entradas usadas hace más tiempo cuando se pasa de max_bytes."""
+
+    PROBE = 64 * 1024
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def entry(self, source, classifier):
+        path = os.path.abspath(source.path)
+        stat = os.stat(path)
+        data = source.data
+        content = hashlib.sha1(data[:self.PROBE] + data[max(0, len(data) - self.PROBE):]).hexdigest()
+        path_key = hashlib.sha1(os.path.normcase(path).encode("utf-8")).hexdigest()[:16]
+        file_key = hashlib.sha1(
+            f"{len(data)}|{stat.st_mtime_ns}|{content}|{classifier.key}|{INDEX_VERSION}".encode("utf-8")
+        ).hexdigest()[:16]
+        return path_key, os.path.join(self.root, f"{path_key}-{file_key}")
+
+    def lookup(self, source, classifier):
+        if self.max_bytes <= 0:
+            return None
+        try:
+            _, directory = self.entry(source, classifier)
+            if not os.path.isdir(directory):
+                return None
+            index = load_log_index(directory)
+            if index["meta"]["size"] != len(source.data):
+                return None
+            os.utime(directory)  # LRU
+            return index
+        except (OSError, ValueError, KeyError) as e:
+            print("Error reading cached log index:", e)
+            return None
+
+    def writer(self, source, classifier):
+        if self.max_bytes <= 0:
+            return LogIndexWriter(None, len(source.data))
+        try:
+            path_key, directory = self.entry(source, classifier)
+            os.makedirs(self.root, exist_ok=True)
+            # Entradas viejas del mismo archivo: ya no coinciden
+            for name in os.listdir(self.root):
+                if name.startswith(path_key + "-") and os.path.join(self.root, name) != directory:
+                    shutil.rmtree(os.path.join(self.root, name), ignore_errors=True)
+        except OSError as e:
+            print("Error preparing log index cache:", e)
+            return LogIndexWriter(None, len(source.data))
+        return _CacheIndexWriter(self, directory, len(source.data), {"path": os.path.abspath(source.path)})
+
+    def evict(self):
+        try:
+            entries = []
+            for name in os.listdir(self.root):
+                directory = os.path.join(self.root, name)
+                if name.endswith(".tmp") or not os.path.isdir(directory):
+                    continue
+                size = sum(e.stat().st_size for e in os.scandir(directory) if e.is_file())
+                entries.append((os.path.getmtime(directory), size, directory))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, directory in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                shutil.rmtree(directory)
+                total -= size
+            except OSError:
+                pass  # en uso (mapeado por este u otro proceso)
+
+class _CacheIndexWriter(LogIndexWriter):
+    def __init__(self, cache, directory, data_len, meta):
+        super().__init__(directory, data_len, meta)
+        self.cache = cache
+
+    def commit(self):
+        if super().commit():
+            self.cache.evict()
+
+INDEX_CACHE = LogIndexCache(os.path.join(CACHE_DIR, "index"), int(SETTINGS.get("index_cache_mb") or 0) * 1024 * 1024)
+
+# ------------------- LOGS COMBINADOS -------------------
+
+MERGE_BLOCK_ROWS = 1 << 20
+MAX_MERGED_LOGS = 255  # el archivo de cada fila se guarda en un uint8
+
+def merge_sorted_times(keys, block=MERGE_BLOCK_ROWS):
+    """k-way merge de arrays de tiempos ya ordenados: (sources, rows, times) del resultado.
+
+    Avanza por bloques: en cada paso toma de cada entrada lo que no pasa del menor de los tiempos
+    donde terminan sus próximos `block` valores (nada de lo que queda puede ir antes), y ordena
+    solo eso. La memoria extra es de un bloque por entrada; a igual tiempo va primero la entrada anterior."""
+    total = sum(len(k) for k in keys)
+    sources = np.empty(total, dtype=np.uint8)
+    rows = np.empty(total, dtype=np.int64)
+    times = np.empty(total, dtype=np.int64)
+    positions = [0] * len(keys)
+    done = 0
+    while done < total:
+        horizon = min(k[min(p + block, len(k)) - 1] for k, p in zip(keys, positions) if p < len(k))
+        pieces = []
+        for source, (k, p) in enumerate(zip(keys, positions)):
+            end = p + int(np.searchsorted(k[p:p + block], horizon, side="right"))
+            if end > p:
+                pieces.append((source, p, end))
+                positions[source] = end
+        piece_times = np.concatenate([keys[source][p:end] for source, p, end in pieces])
+        order = np.argsort(piece_times, kind="stable")
+        count = len(order)
+        sources[done:done + count] = np.concatenate([np.full(end - p, source, dtype=np.uint8)
+                                                     for source, p, end in pieces])[order]
+        rows[done:done + count] = np.concatenate([np.arange(p, end, dtype=np.int64) for _, p, end in pieces])[order]
+        times[done:done + count] = piece_times[order]
+        done += count
+    return sources, rows, times
+
+class MergedLogRecords:
+    """Varios LogRecords vistos como un solo timeline, con la misma interfaz de filas que LogRecords.
+
+    Cada archivo se parsea por separado (y usa su propia entrada de caché); el timeline son solo
+    columnas de índice: archivo y fila de cada registro, en orden de tiempo. offsets_ms se suma a los
+    timestamps de cada archivo para corregir relojes desfasados. Un archivo con timestamps que retroceden
+    mantiene su orden: se ordena por el máximo acumulado de sus tiempos."""
+
+    def __init__(self, parts, offsets_ms, names):
+        if len(parts) > MAX_MERGED_LOGS:
+            raise ValueError(f"At most {MAX_MERGED_LOGS} logs can be merged")
+        self.parts = list(parts)
+        self.offsets_ms = [int(offset) for offset in offsets_ms]
+        self.names = list(names)
+        self.classifier = self.parts[0].classifier
+        self.adopt_index(None)
+
+    @classmethod
+    def from_files(cls, entries, classifier):
+        """entries: (ruta, offset en ms, nombre) por archivo. Los LogRecords quedan vacíos hasta load()."""
+        return cls([LogRecords(LogSource(path), classifier) for path, _, _ in entries],
+                   [offset for _, offset, _ in entries], [name for _, _, name in entries])
+
+    def load(self, workers=None, cancelled=None, progress=None):
+        """Parsea cada archivo y devuelve el timeline combinado para adopt_index (None si se canceló).
+        No toca las columnas propias: se puede llamar fuera del hilo de la GUI."""
+        sizes = [max(1, len(part.source.data)) for part in self.parts]
+        total, done = sum(sizes), 0
+        for part, size in zip(self.parts, sizes):
+            part_progress = None
+            if progress:
+                part_progress = lambda percent, done=done, size=size: progress(int((100 * done + percent * size) / total))
+            if not load_log_records(part, workers, cancelled, part_progress):
+                return None
+            done += size
+        return self.merge()
+
+    def merge(self):
+        keys = [np.maximum.accumulate(part.times) + offset if len(part) else part.times
+                for part, offset in zip(self.parts, self.offsets_ms)]
+        sources, rows, times = merge_sorted_times(keys)
+        categories = np.empty(len(rows), dtype=np.uint8)
+        merged_rows = []
+        for source, part in enumerate(self.parts):
+            mine = np.flatnonzero(sources == source)
+            categories[mine] = part.categories
+            merged_rows.append(mine)
+        return {"sources": sources, "rows": rows, "times": times, "categories": categories, "merged_rows": merged_rows}
+
+    def adopt_index(self, index):
+        if index is None:
+            empty = np.empty(0, dtype=np.int64)
+            index = {"sources": np.empty(0, dtype=np.uint8), "rows": empty, "times": empty,
+                     "categories": np.empty(0, dtype=np.uint8), "merged_rows": [empty] * len(self.parts)}
+        self.sources = index["sources"]
+        self.rows = index["rows"]
+        self.times = index["times"]
+        self.categories = index["categories"]
+        self.merged_rows = index["merged_rows"]  # por archivo: fila del timeline de cada una de sus filas
+
+    def __len__(self):
+        return len(self.times)
+
+    def _part(self, row):
+        source = int(self.sources[row])
+        return source, self.parts[source], int(self.rows[row])
+
+    def source_name(self, row):
+        return self.names[self.sources[row]]
+
+    def timestamp(self, row):
+        source, part, part_row = self._part(row)
+        return ms_to_datetime(part.times[part_row] + self.offsets_ms[source])
+
+    def message(self, row):
+        _, part, part_row = self._part(row)
+        return part.message(part_row)
+
+    def continuation_span(self, row):
+        _, part, part_row = self._part(row)
+        return part.continuation_span(part_row)
+
+    def continuation_line(self, row, subline):
+        _, part, part_row = self._part(row)
+        return part.continuation_line(part_row, subline)
+
+    def row_at_time(self, ms):
+        return int(np.searchsorted(self.times, ms, side="right")) - 1
+
+# ------------------- BÚSQUEDA -------------------
+
+SEARCH_CHUNK_SIZE = 4 * 1024 * 1024
+MERGED_SEARCH_ROWS = 64 * 1024  # filas del timeline combinado por tanda de búsqueda regex
+SEARCH_TOKEN_PATTERN = re.compile(rb"[a-z0-9_\x80-\xff]+")
+SEARCH_KEY_LEN = 8
+_SEARCH_HASH_MUL = 0x100000001B3
+_LOWERCASE = np.arange(256, dtype=np.uint8)
+_LOWERCASE[ord("A"):ord("Z") + 1] += 32
+_WORD_BYTES = np.zeros(256, dtype=bool)
+_WORD_BYTES[np.frombuffer(b"abcdefghijklmnopqrstuvwxyz0123456789_", dtype=np.uint8)] = True
+_WORD_BYTES[0x80:] = True
+# _KEY_MASKS[n]: deja los primeros n bytes de una key big-endian
+_KEY_MASKS = np.array([((1 << (8 * n)) - 1) << (8 * (SEARCH_KEY_LEN - n)) for n in range(SEARCH_KEY_LEN + 1)], dtype=np.uint64)
+
+def _token_key(term, offset, fill=b"\0"):
+    return int.from_bytes(term[offset:offset + SEARCH_KEY_LEN].ljust(SEARCH_KEY_LEN, fill), "big")
+
+def _token_hash(term):
+    # Solo los tokens de más de 16 bytes tienen hash: keys y keys2 ya identifican a los demás
+    h = 0
+    for offset in range(2 * SEARCH_KEY_LEN, len(term), SEARCH_KEY_LEN):
+        h = (h * _SEARCH_HASH_MUL + _token_key(term, offset)) & 0xFFFFFFFFFFFFFFFF
+    return h >> 32
+
+def _fold_token(term):
+    # Minúsculas también fuera de ASCII ("Ñ" y "ñ" son el mismo token); los bytes inválidos quedan igual
+    return term.decode("utf-8", "surrogateescape").lower().encode("utf-8", "surrogateescape")
+
+def index_log_tokens(data, offsets, line_nos, msg_starts, start, end):
+    """TokenPostings de los tokens de data[start:end]. Cada token cuenta para la última fila con
+    timestamp anterior (así entran las líneas de continuación); se ignora el prefijo de timestamp."""
+    buf = np.zeros(end - start + 2 * SEARCH_KEY_LEN, dtype=np.uint8)
+    buf[:end - start] = _LOWERCASE[np.frombuffer(data, dtype=np.uint8, count=end - start, offset=start)]
+    word = _WORD_BYTES[buf]
+    starts = np.flatnonzero(word[1:] & ~word[:-1]) + 1
+    if word[0]:
+        starts = np.concatenate(([0], starts))
+    ends = np.flatnonzero(word[:-1] & ~word[1:]) + 1
+    # El rango empieza en un inicio de línea: la línea de cada byte sale de contar los "\n" anteriores
+    first_line = int(np.searchsorted(offsets, start, side="right")) - 1
+    last_line = int(np.searchsorted(offsets, end, side="left"))
+    line_of_byte = np.cumsum(buf == 0x0A, dtype=np.int32)
+    first_row = max(0, int(np.searchsorted(line_nos, first_line, side="right")) - 1)
+    last_row = int(np.searchsorted(line_nos, last_line, side="left"))
+    row_of_line = np.searchsorted(line_nos[first_row:last_row], np.arange(first_line, last_line + 1), side="right") - 1 + first_row
+    rows = row_of_line[line_of_byte[starts]]
+    keep = rows >= 0
+    keep[keep] = starts[keep] + start >= msg_starts[rows[keep]]
+    starts, ends, rows = starts[keep], ends[keep], rows[keep]
+    lengths = ends - starts
+    # Keys: ventanas de 8 bytes big-endian en cada inicio de token, recortadas al largo del token
+    windows = np.lib.stride_tricks.sliding_window_view(buf, SEARCH_KEY_LEN)
+    keys = windows[starts].copy().view(">u8").ravel().astype(np.uint64)
+    keys &= _KEY_MASKS[np.minimum(lengths, SEARCH_KEY_LEN)]
+    keys2 = windows[starts + SEARCH_KEY_LEN].copy().view(">u8").ravel().astype(np.uint64)
+    keys2 &= _KEY_MASKS[np.clip(lengths - SEARCH_KEY_LEN, 0, SEARCH_KEY_LEN)]
+    hashes = np.zeros(len(starts), dtype=np.uint64)
+    long_tokens = np.flatnonzero(lengths > 2 * SEARCH_KEY_LEN)
+    offset = 2 * SEARCH_KEY_LEN
+    while len(long_tokens):
+        window = windows[starts[long_tokens] + offset].copy().view(">u8").ravel().astype(np.uint64)
+        window &= _KEY_MASKS[np.minimum(lengths[long_tokens] - offset, SEARCH_KEY_LEN)]
+        hashes[long_tokens] = hashes[long_tokens] * np.uint64(_SEARCH_HASH_MUL) + window
+        offset += SEARCH_KEY_LEN
+        long_tokens = long_tokens[lengths[long_tokens] > offset]
+    hashes = (hashes >> np.uint64(32)).astype(np.uint32)
+    # buf solo tiene minúsculas ASCII: los tokens con bytes no ASCII se pasan por _fold_token, una
+    # vez por token distinto
+    high = np.flatnonzero(buf >= 0x80)
+    folding = np.flatnonzero(np.searchsorted(high, starts) < np.searchsorted(high, ends)) if len(high) else high
+    if len(folding):
+        triples = np.column_stack((keys[folding], keys2[folding], hashes[folding].astype(np.uint64)))
+        _, first, inverse = np.unique(triples, axis=0, return_index=True, return_inverse=True)
+        folded = [_fold_token(buf[starts[i]:ends[i]].tobytes()) for i in folding[first].tolist()]
+        inverse = inverse.ravel()
+        keys[folding] = np.array([_token_key(term, 0) for term in folded], dtype=np.uint64)[inverse]
+        keys2[folding] = np.array([_token_key(term, SEARCH_KEY_LEN) for term in folded], dtype=np.uint64)[inverse]
+        hashes[folding] = np.array([_token_hash(term) for term in folded], dtype=np.uint32)[inverse]
+    return TokenPostings.from_tokens(keys, keys2, hashes, rows.astype(np.int32))
+
+class TokenPostings:
+    """Vocabulario ordenado de tokens y las filas donde aparece cada uno (rows[starts[i]:starts[i + 1]]).
+
+    Un token se identifica por keys (bytes 0-8 en big-endian, rellenos con 0), keys2 (bytes 8-16) y
+    hashes (32 bits del resto, 0 si no hay): un prefijo de hasta 16 bytes es un rango contiguo del vocabulario.
+    """
+
+    def __init__(self, keys, keys2, hashes, starts, rows):
+        self.keys = keys
+        self.keys2 = keys2
+        self.hashes = hashes
+        self.starts = starts
+        self.rows = rows
+
+    @classmethod
+    def from_tokens(cls, keys, keys2, hashes, rows):
+        """Agrupa tokens sueltos (en orden de archivo, rows no decreciente)."""
+        order = np.lexsort((hashes, keys2, keys))  # estable: las filas de cada token quedan ordenadas
+        keys, keys2, hashes, rows = keys[order], keys2[order], hashes[order], rows[order]
+        return cls._collapse(keys, keys2, hashes, np.ones(len(keys), dtype=np.int64), rows)
+
+    @classmethod
+    def _collapse(cls, keys, keys2, hashes, counts, rows):
+        # Entradas ya ordenadas, cada una con counts[i] filas consecutivas en rows: se unen las iguales
+        new_entry = np.ones(len(keys), dtype=bool)
+        new_entry[1:] = (keys[1:] != keys[:-1]) | (keys2[1:] != keys2[:-1]) | (hashes[1:] != hashes[:-1])
+        first_of_entry = np.zeros(len(rows), dtype=bool)
+        first_of_entry[(np.cumsum(counts) - counts)[new_entry]] = True
+        keep = np.ones(len(rows), dtype=bool)
+        keep[1:] = (rows[1:] != rows[:-1]) | first_of_entry[1:]
+        starts = np.append(np.flatnonzero(first_of_entry[keep]), np.count_nonzero(keep))
+        return cls(keys[new_entry], keys2[new_entry], hashes[new_entry], starts, rows[keep])
+
+    @classmethod
+    def merge(cls, parts):
+        """Une partes en orden de archivo; las filas de cada token quedan ordenadas y sin repetir."""
+        offsets = np.cumsum([0] + [len(part.rows) for part in parts[:-1]])
+        keys = np.concatenate([part.keys for part in parts])
+        keys2 = np.concatenate([part.keys2 for part in parts])
+        hashes = np.concatenate([part.hashes for part in parts])
+        counts = np.concatenate([np.diff(part.starts) for part in parts])
+        bases = np.concatenate([part.starts[:-1] + offset for part, offset in zip(parts, offsets)])
+        all_rows = np.concatenate([part.rows for part in parts])
+        order = np.lexsort((hashes, keys2, keys))  # estable: a igual token se respeta el orden de las partes
+        keys, keys2, hashes, counts, bases = keys[order], keys2[order], hashes[order], counts[order], bases[order]
+        run_starts = np.cumsum(counts) - counts
+        rows = all_rows[np.repeat(bases - run_starts, counts) + np.arange(int(counts.sum()))]
+        return cls._collapse(keys, keys2, hashes, counts, rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _range(self, values, lo, hi, low_value, high_value):
+        return (lo + int(np.searchsorted(values[lo:hi], low_value, side="left")),
+                lo + int(np.searchsorted(values[lo:hi], high_value, side="right")))
+
+    def find(self, term, prefix=False):
+        """Filas (ordenadas) con el token term, o con algún token que empiece con term si prefix.
+        Con prefix y más de 16 bytes el resultado son candidatos que hay que verificar."""
+        key = np.uint64(_token_key(term, 0))
+        if prefix and len(term) <= SEARCH_KEY_LEN:
+            lo, hi = self._range(self.keys, 0, len(self.keys), key, np.uint64(_token_key(term, 0, b"\xff")))
+        else:
+            lo, hi = self._range(self.keys, 0, len(self.keys), key, key)
+            key2 = np.uint64(_token_key(term, SEARCH_KEY_LEN))
+            if prefix and len(term) <= 2 * SEARCH_KEY_LEN:
+                lo, hi = self._range(self.keys2, lo, hi, key2, np.uint64(_token_key(term, SEARCH_KEY_LEN, b"\xff")))
+            else:
+                lo, hi = self._range(self.keys2, lo, hi, key2, key2)
+            if not prefix:
+                entries = lo + np.flatnonzero(self.hashes[lo:hi] == _token_hash(term))
+                if len(entries) == 1:
+                    return self.rows[self.starts[entries[0]]:self.starts[entries[0] + 1]]
+                return np.unique(np.concatenate([self.rows[self.starts[i]:self.starts[i + 1]] for i in entries] +
+                                                [np.empty(0, dtype=np.int32)]))
+        rows = self.rows[self.starts[lo]:self.starts[hi]]
+        return rows if hi - lo == 1 else np.unique(rows)
+
+def _unique_sorted(values):
+    if len(values) < 2:
+        return values
+    return values[np.concatenate(([True], values[1:] != values[:-1]))]
+
+def _intersect_sorted(a, b):
+    if not len(a) or not len(b):
+        return a[:0]
+    idx = np.minimum(np.searchsorted(a, b), len(a) - 1)
+    return b[a[idx] == b]
+
+class SearchIndex:
+    """Índice invertido de los tokens (palabras en minúsculas) de un LogRecords.
+
+    Son varias TokenPostings en orden de archivo. update() indexa solo lo agregado desde la última
+    llamada y fusiona las partes finales mientras sean parecidas en tamaño y no pasen MERGE_LIMIT,
+    así las fusiones no crecen con el log y las partes quedan pocas."""
+
+    MERGE_LIMIT = 4 * 1024 * 1024  # filas por parte
+
+    def __init__(self):
+        self.parts = []
+        self.end = 0  # bytes del source ya indexados en parts (solo líneas completas)
+        self.tail = None  # tokens de la última línea si no termina en "\n"; se reemplaza en cada update()
+        self.tail_end = 0
+
+    def update(self, logs, cancelled=None, progress=None):
+        """Indexa hasta el final actual de logs. Devuelve False si cancelled() cortó el trabajo."""
+        source = logs.source
+        offsets, line_nos, msg_starts = source.offsets, logs.line_nos, logs.msg_starts
+        end = int(offsets[-1])
+        # Una última línea a medio escribir va aparte, en tail: al completarse (modo follow) se
+        # vuelve a indexar entera y sus tokens viejos se descartan
+        complete = int(offsets[-2]) if source.has_partial_tail() else end
+        start = min(self.end, complete)
+        new_parts = []
+        for chunk_start, chunk_end in log_chunk_ranges(source.data, SEARCH_CHUNK_SIZE, start, complete):
+            if cancelled and cancelled():
+                return False
+            new_parts.append(index_log_tokens(source.data, offsets, line_nos, msg_starts, chunk_start, chunk_end))
+            if progress:
+                progress(int(100 * (chunk_end - start) / (end - start)))
+        tail = None
+        if complete < end:
+            tail = index_log_tokens(source.data, offsets, line_nos, msg_starts, complete, end)
+        parts = list(self.parts)
+        for part in new_parts:
+            parts.append(part)
+            while (len(parts) > 1 and len(parts[-2]) <= 2 * len(parts[-1])
+                   and len(parts[-2]) + len(parts[-1]) <= self.MERGE_LIMIT):
+                parts[-2:] = [TokenPostings.merge(parts[-2:])]
+        self.parts, self.end, self.tail, self.tail_end = parts, complete, tail, end
+        return True
+
+    def behind(self, logs):
+        """True si logs creció (modo follow) desde el último update()."""
+        return self.tail_end < int(logs.source.offsets[-1])
+
+    def query(self, text, logs):
+        """Filas cuyo texto tiene todas las palabras de text. La última cuenta también como prefijo,
+        salvo que text termine en espacio. None si text no tiene palabras."""
+        terms = [term if term.isascii() else _fold_token(term)
+                 for term in SEARCH_TOKEN_PATTERN.findall(text.encode("utf-8").lower())]
+        if not terms:
+            return None
+        prefix_last = not text[-1:].isspace()
+        matches = []
+        for i, term in enumerate(terms):
+            prefix = prefix_last and i == len(terms) - 1
+            # Las partes están en orden de archivo: concatenadas quedan ordenadas
+            parts = self.parts if self.tail is None else self.parts + [self.tail]
+            rows = _unique_sorted(np.concatenate([part.find(term, prefix) for part in parts] +
+                                                 [np.empty(0, dtype=np.int32)]))
+            if prefix and len(term) > 2 * SEARCH_KEY_LEN:
+                rows = self._verify_prefix(rows, term, logs)
+            matches.append(rows)
+        # Se intersecta desde el término más raro: cada paso busca el resultado chico en el grande
+        matches.sort(key=len)
+        result = matches[0]
+        for rows in matches[1:]:
+            if not len(result):
+                break
+            result = _intersect_sorted(rows, result)
+        return result.astype(np.int64)
+
+    def _verify_prefix(self, rows, term, logs):
+        pattern = re.compile(rb"(?<![a-z0-9_\x80-\xff])" + re.escape(term))
+        offsets = logs.source.offsets
+        matches = []
+        fold = (lambda text: text.lower()) if term.isascii() else _fold_token
+        for row in rows:
+            _, end = logs.continuation_span(int(row))
+            if pattern.search(fold(logs.source.data[logs.msg_starts[row]:offsets[end]])):
+                matches.append(row)
+        return np.array(matches, dtype=np.int32)
+
+class MergedSearchIndex:
+    """Un SearchIndex por archivo de un MergedLogRecords; devuelve filas del timeline combinado."""
+
+    def __init__(self):
+        self.indexes = []
+
+    def update(self, logs, cancelled=None, progress=None):
+        while len(self.indexes) < len(logs.parts):
+            self.indexes.append(SearchIndex())
+        for i, (index, part) in enumerate(zip(self.indexes, logs.parts)):
+            part_progress = None
+            if progress:
+                part_progress = lambda percent, i=i: progress((100 * i + percent) // len(logs.parts))
+            if not index.update(part, cancelled, part_progress):
+                return False
+        return True
+
+    def behind(self, logs):
+        return len(self.indexes) < len(logs.parts) or any(index.behind(part) for index, part in zip(self.indexes, logs.parts))
+
+    def query(self, text, logs):
+        results = [index.query(text, part) for index, part in zip(self.indexes, logs.parts)]
+        if not results or results[0] is None:
+            return None
+        return np.sort(np.concatenate([merged[rows] for merged, rows in zip(logs.merged_rows, results)]))
+
+def regex_search_rows(logs, pattern, start, end):
+    """Filas de logs con alguna coincidencia de pattern (bytes) en data[start:end], sin contar el prefijo de timestamp."""
+    source = logs.source
+    positions = np.array([match.start() for match in pattern.finditer(source.data[start:end])], dtype=np.int64) + start
+    lines = np.searchsorted(source.offsets, positions, side="right") - 1
+    rows = np.searchsorted(logs.line_nos, lines, side="right") - 1
+    keep = rows >= 0
+    keep[keep] = positions[keep] >= logs.msg_starts[rows[keep]]
+    return np.unique(rows[keep])
+
+def merged_regex_search_rows(logs, pattern, start, stop):
+    """Filas [start, stop) de un MergedLogRecords con alguna coincidencia de pattern. Las filas de cada
+    archivo dentro del rango son consecutivas: se busca en el tramo de bytes que ocupan (con sus continuaciones)."""
+    found = [np.empty(0, dtype=np.int64)]
+    for part, merged in zip(logs.parts, logs.merged_rows):
+        first, end = (int(i) for i in np.searchsorted(merged, (start, stop)))
+        if first == end:
+            continue
+        offsets = part.source.offsets
+        byte_start = int(offsets[part.line_nos[first]])
+        byte_end = int(offsets[part.line_nos[end]]) if end < len(part) else int(offsets[-1])
+        found.append(merged[regex_search_rows(part, pattern, byte_start, byte_end)])
+    return np.sort(np.concatenate(found))
+
+EXPORT_ENCODE_SHARE = 90  # parte de la barra de progreso que ocupa el reencode; el resto es empaquetar
+EXPORT_TRIM_MIN_SAVING = 0.1  # se ofrece recortar si se ahorra al menos esta fracción del video
+COPY_VIDEO_CODECS = ("h264", "hevc")  # se pasan tal cual al video.mp4 del .lupi
+COPY_AUDIO_CODECS = ("aac", "mp3")
+
+class ExportCancelled(Exception):
+    pass
+
+def run_ffmpeg_progress(args, progress=None, cancelled=None):
+    """Corre ffmpeg con args y -progress pipe:1; llama progress(segundos de salida, velocidad) con cada
+    informe (velocidad None si ffmpeg todavía no la sabe). Si cancelled() da True mata ffmpeg y lanza
+    ExportCancelled; si ffmpeg falla lanza RuntimeError con el final de su stderr."""
+    with tempfile.TemporaryFile() as errors:
+        proc = subprocess.Popen([FFMPEG_PATH, "-hide_banner", "-nostdin", "-nostats", "-progress", "pipe:1"] + args,
+                                creationflags=NO_WINDOW_FLAGS, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                stderr=errors, text=True)
+        done, speed = 0.0, None
+        try:
+            for line in proc.stdout:
+                if cancelled and cancelled():
+                    raise ExportCancelled()
+                key, _, value = line.strip().partition("=")
+                try:
+                    if key in ("out_time_us", "out_time_ms"):  # los dos vienen en microsegundos
+                        done = int(value) / 1e6
+                    elif key == "speed":
+                        speed = float(value.rstrip("x"))
+                except ValueError:
+                    pass  # N/A al principio
+                if key == "progress" and progress:
+                    progress(done, speed)
+        except BaseException:
+            proc.kill()
+            raise
+        finally:
+            proc.wait()
+            proc.stdout.close()
+        if proc.returncode:
+            errors.seek(0)
+            tail = errors.read()[-2000:].decode("utf-8", errors="ignore").strip()
+            raise RuntimeError(f"ffmpeg exited with code {proc.returncode}\n{tail}")
+
+def probe_codecs(video_path):
+    """Códec del primer stream de cada tipo, p. ej. {"video": "h264", "audio": "aac"}; {} si ffprobe falla."""
+    try:
+        result = subprocess.run([
+            FFPROBE_PATH, "-v", "error", "-show_entries", "stream=codec_type,codec_name", "-of", "json", video_path
+        ], creationflags=NO_WINDOW_FLAGS, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        streams = json.loads(result.stdout).get("streams", []) if not result.returncode else []
+    except (OSError, ValueError):
+        return {}
+    codecs = {}
+    for stream in streams:
+        codecs.setdefault(stream.get("codec_type"), stream.get("codec_name"))
+    return codecs
+
+def export_trim_frames(timeline, start, end, keyframes=None):
+    """[first, stop) de los frames que cubren start..end segundos. Con keyframes (copia sin reencodear)
+    el rango se agranda hasta keyframes: first es un keyframe y stop el siguiente, o el final del video."""
+    first = max(0, timeline.frame_at(start))
+    stop = min(timeline.total_frames, timeline.frame_at(end) + 1)
+    if keyframes is not None and len(keyframes):
+        first = int(keyframes[max(0, int(np.searchsorted(keyframes, first, side="right")) - 1)])
+        after = int(np.searchsorted(keyframes, stop, side="left"))
+        stop = int(keyframes[after]) if after < len(keyframes) else timeline.total_frames
+    return first, max(stop, first + 1)
+
+def format_eta(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}" if seconds >= 3600 else f"{seconds // 60}:{seconds % 60:02d}"
+
+# .lupi v2: manifest.json con versión y sha256 de cada entrada, el video guardado sin comprimir (ya lo
+# está), los logs en deflate y sus columnas ya parseadas en index/<log>/. Los v1 son un zip deflate sin
+# manifiesto ni índices; se siguen leyendo.
+LUPI_VERSION = 2
+LUPI_CHUNK_SIZE = 1024 * 1024
+
+def lupi_compression(name):
+    if name.endswith((".mp4", ".jpg")):
+        return zipfile.ZIP_STORED
+    # Logs incluidos: bzip2 y LZMA achican algo más, pero comprimen 3 a 25 veces más lento (horas en logs de GB)
+    return zipfile.ZIP_DEFLATED
+
+def zip_write(z, path, name, progress=None):
+    """Copia path a la entrada name de z por chunks. Devuelve su sha256; progress(bytes) con cada chunk."""
+    digest = hashlib.sha256()
+    info = zipfile.ZipInfo.from_file(path, name)
+    info.compress_type = lupi_compression(name)
+    with open(path, "rb") as src, z.open(info, "w", force_zip64=True) as dst:
+        while True:
+            chunk = src.read(LUPI_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            dst.write(chunk)
+            if progress:
+                progress(len(chunk))
+    return digest.hexdigest()
+
+def zip_extract_checked(z, name, directory, sha256):
+    """Extrae la entrada name bajo directory verificando su sha256 (ValueError si no coincide)."""
+    path = os.path.normpath(os.path.join(directory, *name.split("/")))
+    if not path.startswith(os.path.normpath(directory) + os.sep):
+        raise ValueError(f"Invalid entry name in .lupi: {name}")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    digest = hashlib.sha256()
+    with z.open(name) as src, open(path, "wb") as dst:
+        while True:
+            chunk = src.read(LUPI_CHUNK_SIZE)
+            if not chunk:
+                break
+            digest.update(chunk)
+            dst.write(chunk)
+    if digest.hexdigest() != sha256:
+        raise ValueError(f"Corrupted .lupi: checksum mismatch in {name}")
+
+def write_log_index(logs, directory):
+    """Escribe las columnas de un LogRecords ya completo con el formato de load_log_index, pero las int64
+    como diferencias entre valores consecutivos: así comprimen unas cuatro veces mejor."""
+    columns = {"offsets": logs.source.offsets}
+    columns.update((name, getattr(logs, name)) for name, _ in LogRecords.COLUMNS)
+    delta = [name for name, dtype in INDEX_COLUMNS if dtype == np.int64]
+    try:
+        os.makedirs(directory)
+        for name, dtype in INDEX_COLUMNS:
+            values = np.asarray(columns[name], dtype=dtype)
+            if name in delta:
+                values = np.diff(values, prepend=dtype(0))
+            values.tofile(os.path.join(directory, name + ".bin"))
+        meta = {"version": INDEX_VERSION, "lines": len(logs.source), "rows": len(logs), "size": len(logs.source.data),
+                "classifier": logs.classifier.key, "delta": delta}
+        with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        return True
+    except OSError as e:
+        print("Error writing log index for .lupi:", e)
+        shutil.rmtree(directory, ignore_errors=True)
+        return False
+
+def load_lupi_log(directory, file):
+    """LogRecords de un log extraído de un .lupi: adopta index/<file> si está y sirve para este archivo
+    con las reglas de resaltado actuales; si no, lo parsea."""
+    logs = LogRecords(LogSource(os.path.join(directory, file)), HIGHLIGHTER)
+    index_dir = os.path.join(directory, "index", file)
+    if os.path.isdir(index_dir):
+        try:
+            index = load_log_index(index_dir)
+            for name in index["meta"].get("delta", []):
+                index[name] = np.cumsum(index[name])
+            if (index["meta"].get("classifier") == logs.classifier.key
+                    and int(index["offsets"][-1]) == len(logs.source.data)):
+                logs.adopt_index(index)
+                return logs
+        except (OSError, ValueError, KeyError) as e:
+            print("Error reading log index from .lupi:", e)
+    load_log_records(logs)
+    return logs
+
+def export_analysis(player, out_path, progress=None, cancelled=None, window=None):
+    """Escribe el .lupi de player en out_path. progress(porcentaje, paso, detalle) informa el avance;
+    si cancelled() da True se corta con ExportCancelled. Se escribe en out_path + ".part" y se renombra
+    al terminar: si falla, out_path queda como estaba. Los temporales se borran siempre. window:
+    (inicio, fin) en segundos del video para exportar solo ese tramo."""
+    tmpdir = tempfile.mkdtemp()
+    part_path = out_path + ".part"
+    def step(percent, message, detail=""):
+        if cancelled and cancelled():
+            raise ExportCancelled()
+        if progress:
+            progress(percent, message, detail)
+    try:
+        _write_analysis(player, part_path, tmpdir, step, cancelled, window)
+        os.replace(part_path, out_path)
+    except BaseException:
+        try:
+            os.remove(part_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+
+def _write_analysis(player, out_path, tmpdir, step, cancelled, window):
+    # H.264/HEVC se copia sin reencodear: rápido y sin perder calidad en cada ida y vuelta por un .lupi
+    codecs = probe_codecs(player.video_path)
+    copy = codecs.get("video") in COPY_VIDEO_CODECS
+    message = "Copying video..." if copy else "Reencoding video..."
+    step(0, message)
+    recoded_video_path = os.path.join(tmpdir, "video.mp4")
+    timeline = player.timeline
+    first, stop = 0, timeline.total_frames
+    input_args, frame_args = [], []
+    if window is not None:
+        # Copiando solo se puede cortar en keyframes: se agranda el tramo hasta ellos en vez de reencodear los bordes
+        keyframes = None
+        if copy:
+            index = VIDEO_CACHE.lookup_index(player.video_path) or scan_video_index(player.video_path)
+            keyframes = index[1] if index is not None else None
+            copy = keyframes is not None
+            message = "Copying video..." if copy else "Reencoding video..."
+        first, stop = export_trim_frames(timeline, window[0], window[1], keyframes)
+        # Medio frame de margen: con copia ffmpeg arranca en el keyframe anterior a -ss, reencodeando en
+        # el primer frame desde -ss
+        half = timeline.frame_duration(first) / 2
+        input_args = ["-ss", f"{timeline.time_of(first) + (half if copy else -half):.6f}"]
+        if stop < timeline.total_frames:
+            # -to corta el audio; el video por cantidad, porque copiando -to compara el dts y con B-frames
+            # se cuelan frames del GOP siguiente
+            input_args += ["-to", f"{timeline.time_of(stop) - timeline.frame_duration(stop - 1) / 2:.6f}"]
+            frame_args = ["-frames:v", str(stop - first)]
+    duration = max(timeline.time_of(stop) - timeline.time_of(first), 1e-3)
+    def encode_progress(done, speed):
+        detail = f"{min(100, int(100 * done / duration))}%"
+        if speed:
+            detail += f"   {speed:.2f}x   ETA {format_eta(max(0.0, duration - done) / speed)}"
+        step(int(EXPORT_ENCODE_SHARE * min(1.0, done / duration)), message, detail)
+    if copy:
+        codec_args = ["-c:v", "copy", "-avoid_negative_ts", "make_zero"]
+    else:
+        codec_args = ["-b:v", "2M", "-preset", "fast"]
+    codec_args += ["-c:a", "copy" if codecs.get("audio") in COPY_AUDIO_CODECS else "aac"] + frame_args
+    run_ffmpeg_progress([
+        "-y"] + input_args + ["-i", player.video_path] + codec_args + [
+        "-fps_mode", "passthrough",  # mantiene los tiempos de los videos de fps variable
+        recoded_video_path
+    ], encode_progress, cancelled)
+
+    step(EXPORT_ENCODE_SHARE, "Saving logs...")
+    # Varios logs: cada uno en su archivo (logs.txt, logs_1.txt...), con nombre y offset en meta.json
+    merged = isinstance(player.logs, MergedLogRecords)
+    log_files = []
+    index_files = []
+    for i, part in enumerate(player.logs.parts if merged else [player.logs]):
+        log_files.append("logs.txt" if i == 0 else f"logs_{i}.txt")
+        with open(os.path.join(tmpdir, log_files[-1]), "wb") as f:
+            part.source.write_to(f)
+        # Sus columnas ya parseadas: al importar no hace falta volver a parsear
+        directory = os.path.join(tmpdir, "index", log_files[-1])
+        if write_log_index(part, directory):
+            index_files += [(os.path.join(directory, name), f"index/{log_files[-1]}/{name}")
+                            for name in sorted(os.listdir(directory))]
+
+    step(EXPORT_ENCODE_SHARE + 2, "Saving metadata...")
+    # Índice de tiempos del video exportado: al abrir el .lupi no hace falta correr ffprobe
+    index = scan_video_index(recoded_video_path)
+    meta = {
+        # Recortado, el video exportado empieza más tarde
+        "video_start_time": (player.video_start_time + datetime.timedelta(seconds=timeline.time_of(first))).isoformat(),
+        "fps": player.fps,
+        "total_frames": len(index[0]) if index is not None else stop - first
+    }
+    if merged:
+        meta["logs"] = [{"file": file, "name": name, "offset_ms": offset}
+                        for file, name, offset in zip(log_files, player.logs.names, player.logs.offsets_ms)]
+    meta_path = os.path.join(tmpdir, "meta.json")
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    thumbs = None
+    if player.thumbnails.complete() and window is None:  # recortado, se vuelven a armar al abrirlo
+        thumbs = (os.path.join(tmpdir, "thumbs.jpg"), os.path.join(tmpdir, "thumbs.json"))
+        player.thumbnails.save(*thumbs)
+    index_path = None
+    if index is not None:
+        index_path = os.path.join(tmpdir, "timeline.npz")
+        save_video_index(index_path, index)
+
+    step(EXPORT_ENCODE_SHARE + 4, "Creating cat crate...")
+    files = [(recoded_video_path, "video.mp4")] + [(os.path.join(tmpdir, file), file) for file in log_files]
+    files += index_files
+    files.append((meta_path, "meta.json"))
+    if thumbs:
+        files += [(thumbs[0], "thumbs.jpg"), (thumbs[1], "thumbs.json")]
+    if index_path:
+        files.append((index_path, "timeline.npz"))
+    total = max(1, sum(os.path.getsize(path) for path, _ in files))
+    written = [0]
+    def zip_progress(count):
+        written[0] += count
+        step(EXPORT_ENCODE_SHARE + 4 + (100 - EXPORT_ENCODE_SHARE - 4) * written[0] // total, "Creating cat crate...")
+    manifest = {"format": "lupi", "version": LUPI_VERSION, "files": {}}
+    with zipfile.ZipFile(out_path, "w") as z:
+        for path, name in files:
+            manifest["files"][name] = {"size": os.path.getsize(path), "sha256": zip_write(z, path, name, zip_progress)}
+        z.writestr("manifest.json", json.dumps(manifest, indent=1), zipfile.ZIP_DEFLATED)
+    step(100, "Done")
+
+def import_analysis(lupi_path):
+    """Extrae un .lupi y devuelve (video_path, logs, video_start_time, fps). Si falla (ValueError si está
+    corrupto o es de una versión desconocida) no deja nada extraído."""
+    tmpdir = tempfile.mkdtemp()
+    try:
+        return _read_analysis(lupi_path, tmpdir)
+    except BaseException:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        raise
+
+def _read_analysis(lupi_path, tmpdir):
+    with zipfile.ZipFile(lupi_path, "r") as z:
+        if "manifest.json" in z.namelist():
+            manifest = json.loads(z.read("manifest.json"))
+            if manifest.get("format") != "lupi" or manifest.get("version") != LUPI_VERSION:
+                raise ValueError(f"Unsupported .lupi version {manifest.get('version')}")
+            for name, entry in manifest["files"].items():
+                zip_extract_checked(z, name, tmpdir, entry["sha256"])
+        else:
+            z.extractall(tmpdir)  # v1: sin manifiesto ni índices de logs
+
+    video_path = os.path.join(tmpdir, "video.mp4")
+    meta_path = os.path.join(tmpdir, "meta.json")
+
+    # Metadata
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    video_start_time = datetime.datetime.fromisoformat(meta["video_start_time"])
+    fps = meta["fps"]
+
+    # Miniaturas del slider e índice del video (los .lupi viejos no los traen)
+    thumbs = (os.path.join(tmpdir, "thumbs.jpg"), os.path.join(tmpdir, "thumbs.json"))
+    if os.path.exists(thumbs[0]) and os.path.exists(thumbs[1]):
+        VIDEO_CACHE.store_thumbnails(video_path, files=thumbs)
+    index_path = os.path.join(tmpdir, "timeline.npz")
+    if os.path.exists(index_path):
+        VIDEO_CACHE.store_index(video_path, file=index_path)
+
+    # Logs originales, con su índice si el .lupi lo trae (v2) o reparseados
+    if "logs" in meta:
+        logs = MergedLogRecords([load_lupi_log(tmpdir, os.path.basename(entry["file"])) for entry in meta["logs"]],
+                                [entry["offset_ms"] for entry in meta["logs"]], [entry["name"] for entry in meta["logs"]])
+        logs.adopt_index(logs.merge())
+    else:
+        logs = load_lupi_log(tmpdir, "logs.txt")
+
+    return video_path, logs, video_start_time, fps
+
+def import_analysis_or_warn(lupi_path, parent=None):
+    """import_analysis mostrando el error en un diálogo. None si no se pudo abrir."""
+    try:
+        return import_analysis(lupi_path)
+    except (ValueError, KeyError, zipfile.BadZipFile, OSError) as e:
+        QMessageBox.critical(parent, "Could not open analysis", f"Could not open {os.path.basename(lupi_path)}:\n{e}")
+        return None
+
+def open_lupi_from_cold(from_file=None):
+    path = from_file
+    title = str(os.path.basename(path))
+    if path:
+        analysis = import_analysis_or_warn(path)
+        if analysis is None:
+            return
+        video_path, logs, video_start_time, fps = analysis
+        player = LogVideoPlayer(video_path, logs, video_start_time, fps, title)
+        player.showMaximized()
+
+# ------------------- MODELO DE LOGS -------------------
+
+class LogTableModel(QAbstractTableModel):
+    """Modelo virtual sobre LogRecords: texto y colores se calculan en data() solo para las filas visibles.
+
+    Las filas con líneas de continuación (callstacks) se pueden expandir; solo se guardan los
+    registros expandidos, así que fila de la vista y registro coinciden hasta el primero de ellos.
+    """
+
+    HEADERS = ["Timestamp", "Console output"]
+    MERGED_HEADERS = ["Timestamp", "Source", "Console output"]  # varios logs: archivo de cada línea
+
+    def __init__(self, logs, video_start_time, video_end_time, parent=None):
+        super().__init__(parent)
+        self.logs = logs
+        self.headers = self.MERGED_HEADERS if isinstance(logs, MergedLogRecords) else self.HEADERS
+        self.set_video_range(video_start_time, video_end_time)
+        self.colors = {code: (QColor(bg) if bg else None, QColor(fg) if fg else None)
+                       for code, (bg, fg) in logs.classifier.colors.items()}
+        self.video_colors = (QColor(VIDEO_RANGE_COLORS[0]), QColor(VIDEO_RANGE_COLORS[1]))
+        style = QApplication.style()
+        self.expand_icons = (style.standardIcon(QStyle.SP_ArrowRight), style.standardIcon(QStyle.SP_ArrowDown))
+        self._clear_expanded()
+
+    def set_video_range(self, video_start_time, video_end_time):
+        # Rango del video en ms, redondeado para que la comparación sea la misma que con datetime
+        start_us = (video_start_time - EPOCH) // datetime.timedelta(microseconds=1)
+        end_us = (video_end_time - EPOCH) // datetime.timedelta(microseconds=1)
+        self.video_start_ms = -(-start_us // 1000)
+        self.video_end_ms = end_us // 1000
+
+    def _clear_expanded(self):
+        self.expanded = []  # registros expandidos, ordenados
+        self._update_expanded()
+
+    def _update_expanded(self):
+        counts = np.array([self.continuation_count(record) for record in self.expanded], dtype=np.int64)
+        self._exp_cum = np.cumsum(counts)
+        self._exp_counts = counts
+        # Fila de la vista de cada registro expandido
+        self._exp_rows = np.array(self.expanded, dtype=np.int64) + self._exp_cum - counts
+
+    def continuation_count(self, record):
+        first, end = self.logs.continuation_span(record)
+        return end - first
+
+    def locate(self, row):
+        """(registro, sublínea) de una fila de la vista; sublínea 0 es la propia línea con timestamp."""
+        if not self.expanded:
+            return row, 0
+        i = int(np.searchsorted(self._exp_rows, row, side="right")) - 1
+        if i < 0:
+            return row, 0
+        if row <= self._exp_rows[i] + self._exp_counts[i]:
+            return self.expanded[i], int(row - self._exp_rows[i])
+        return int(row - self._exp_cum[i]), 0
+
+    def record_for_row(self, row):
+        return self.locate(row)[0]
+
+    def row_for_record(self, record):
+        i = bisect.bisect_left(self.expanded, record)
+        return record + (int(self._exp_cum[i - 1]) if i else 0)
+
+    def is_expanded(self, record):
+        i = bisect.bisect_left(self.expanded, record)
+        return i < len(self.expanded) and self.expanded[i] == record
+
+    def toggle_expanded(self, row):
+        """Expande o colapsa las líneas de continuación del registro de la fila. Devuelve False si no tiene."""
+        record, _ = self.locate(row)
+        count = self.continuation_count(record)
+        if not count:
+            return False
+        header_row = self.row_for_record(record)
+        if self.is_expanded(record):
+            self.beginRemoveRows(QModelIndex(), header_row + 1, header_row + count)
+            self.expanded.remove(record)
+            self._update_expanded()
+            self.endRemoveRows()
+        else:
+            self.beginInsertRows(QModelIndex(), header_row + 1, header_row + count)
+            bisect.insort(self.expanded, record)
+            self._update_expanded()
+            self.endInsertRows()
+        header = self.index(header_row, 0)
+        self.dataChanged.emit(header, header, [Qt.DecorationRole])
+        return True
+
+    def _collapse_last(self):
+        # El último registro todavía puede ganar líneas de continuación: se colapsa antes de crecer
+        last = len(self.logs) - 1
+        if self.expanded and self.expanded[-1] == last:
+            self.toggle_expanded(self.row_for_record(last))
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.logs) + (int(self._exp_cum[-1]) if self.expanded else 0)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def row_colors(self, row):
+        colors = self.colors.get(int(self.logs.categories[row]))
+        if colors is None and self.video_start_ms <= self.logs.times[row] <= self.video_end_ms:
+            colors = self.video_colors
+        return colors
+
+    def append_chunk(self, chunk):
+        """Agrega al final las filas de un resultado de scan_log_chunk."""
+        self._collapse_last()
+        previous_last = len(self.logs) - 1
+        first, count = self.rowCount(), len(chunk[2])
+        if count:
+            self.beginInsertRows(QModelIndex(), first, first + count - 1)
+        self.logs.extend(chunk)
+        if count:
+            self.endInsertRows()
+        if previous_last >= 0:
+            # Puede haber ganado líneas de continuación (cambia el ícono)
+            header = self.index(self.row_for_record(previous_last), 0)
+            self.dataChanged.emit(header, header, [Qt.DecorationRole])
+
+    def adopt_index(self, index):
+        self.beginResetModel()
+        self.logs.adopt_index(index)
+        self._clear_expanded()
+        self.endResetModel()
+
+    def set_logs(self, logs):
+        self.beginResetModel()
+        self.logs = logs
+        self._clear_expanded()
+        self.endResetModel()
+
+    def follow_source(self):
+        """Parsea solo lo agregado al archivo desde la última vez. Devuelve el estado de LogSource.refresh."""
+        source = self.logs.source
+        partial = source.has_partial_tail()
+        status = source.refresh()
+        if status != "grown":
+            return status
+        if partial:
+            # La última línea estaba a medio escribir: se vuelve a parsear junto con lo nuevo
+            self._collapse_last()
+            last_record = len(self.logs) - 1
+            if last_record >= 0 and self.logs.line_nos[last_record] == len(source) - 1:
+                last_row = self.row_for_record(last_record)
+                self.beginRemoveRows(QModelIndex(), last_row, last_row)
+                self.logs.drop_last_line()
+                self.endRemoveRows()
+            else:
+                self.logs.drop_last_line()
+        self.append_chunk(scan_log_chunk(source.data, int(source.offsets[-1]), len(source.data), self.logs.classifier))
+        return status
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record, subline = self.locate(index.row())
+        if role == Qt.DisplayRole:
+            message_column = index.column() == len(self.headers) - 1
+            if subline:
+                if not message_column:
+                    return ""
+                return self.logs.continuation_line(record, subline).rstrip().expandtabs(4)
+            if index.column() == 0:
+                return self.logs.timestamp(record).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            if not message_column:
+                return self.logs.source_name(record)
+            return self.logs.message(record)
+        if role == Qt.DecorationRole:
+            if subline or index.column() != 0 or not self.continuation_count(record):
+                return None
+            return self.expand_icons[self.is_expanded(record)]
+        if role == Qt.ToolTipRole:
+            if subline or index.column() != 0:
+                return None
+            count = self.continuation_count(record)
+            return f"{count} more line(s), click to expand/collapse" if count else None
+        if role == Qt.BackgroundRole:
+            colors = self.row_colors(record)
+            return colors[0] if colors else None
+        if role == Qt.ForegroundRole:
+            colors = self.row_colors(record)
+            return colors[1] if colors else None
+        return None
+
+class LogLoader(QThread):
+    """Parsea el LogSource de un LogRecords en segundo plano y entrega los chunks en orden.
+
+    Los chunks se agregan en el hilo de la GUI (chunk_ready -> LogTableModel.append_chunk)."""
+
+    chunk_ready = Signal(object)
+    index_ready = Signal(object)  # índice completo sacado de la caché
+    progress = Signal(int)  # porcentaje del archivo
+
+    def __init__(self, logs, parent=None):
+        super().__init__(parent)
+        self.logs = logs
+
+    def run(self):
+        if isinstance(self.logs, MergedLogRecords):
+            # Cada archivo se parsea completo y el timeline se entrega entero (index_ready -> adopt_index)
+            merged = self.logs.load(cancelled=self.isInterruptionRequested, progress=self.progress.emit)
+            if merged is not None:
+                self.index_ready.emit(merged)
+            return
+        index = INDEX_CACHE.lookup(self.logs.source, self.logs.classifier)
+        if index is not None:
+            self.index_ready.emit(index)
+            self.progress.emit(100)
+            return
+        size = max(1, len(self.logs.source.data))
+        writer = INDEX_CACHE.writer(self.logs.source, self.logs.classifier)
+        chunks = iter_log_chunks(self.logs.source, self.logs.classifier)
+        completed = False
+        try:
+            for chunk in chunks:
+                if self.isInterruptionRequested():
+                    return
+                self.chunk_ready.emit(chunk)
+                writer.add_chunk(chunk)
+                self.progress.emit(int(100 * chunk[0][-1] / size))
+            completed = True
+        finally:
+            chunks.close()
+            if completed:
+                writer.commit()
+            else:
+                writer.abort()
+
+class SearchIndexer(QThread):
+    """Pone al día un SearchIndex en segundo plano (al terminar de cargar el log y con lo que agrega el modo follow)."""
+
+    progress = Signal(int)
+
+    def __init__(self, index, logs, parent=None):
+        super().__init__(parent)
+        self.index = index
+        self.logs = logs
+
+    def run(self):
+        self.index.update(self.logs, self.isInterruptionRequested, self.progress.emit)
+
+class RegexSearcher(QThread):
+    """Busca una regex por chunks y va entregando las filas que coinciden (found, en orden)."""
+
+    found = Signal(object)
+    progress = Signal(int)
+
+    def __init__(self, logs, pattern, parent=None):
+        super().__init__(parent)
+        self.logs = logs
+        self.pattern = pattern
+        self.end = int(logs.source.offsets[-1]) if isinstance(logs, LogRecords) else 0  # bytes que busca
+
+    def run(self):
+        if isinstance(self.logs, MergedLogRecords):
+            total = len(self.logs)
+            for start in range(0, total, MERGED_SEARCH_ROWS):
+                if self.isInterruptionRequested():
+                    return
+                stop = min(total, start + MERGED_SEARCH_ROWS)
+                rows = merged_regex_search_rows(self.logs, self.pattern, start, stop)
+                if len(rows):
+                    self.found.emit(rows)
+                self.progress.emit(int(100 * stop / total))
+            return
+        for start, stop in log_chunk_ranges(self.logs.source.data, SEARCH_CHUNK_SIZE, 0, self.end):
+            if self.isInterruptionRequested():
+                return
+            rows = regex_search_rows(self.logs, self.pattern, start, stop)
+            if len(rows):
+                self.found.emit(rows)
+            self.progress.emit(int(100 * stop / max(1, self.end)))
+
+class LogFilterModel(QAbstractProxyModel):
+    """Proxy sobre LogTableModel que muestra solo los registros de records (array ordenado).
+
+    Ofrece la misma interfaz de registros que LogTableModel (record_for_row, row_for_record...)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.records = np.empty(0, dtype=np.int64)
+
+    def setSourceModel(self, model):
+        super().setSourceModel(model)
+        model.modelReset.connect(lambda: self.set_records(np.empty(0, dtype=np.int64)))
+
+    def set_records(self, records):
+        self.beginResetModel()
+        self.records = records
+        self.endResetModel()
+
+    def add_records(self, records):
+        """Agrega registros posteriores al último que ya tiene (resultados que llegan en orden)."""
+        if len(self.records):
+            records = records[records > self.records[-1]]
+        if not len(records):
+            return
+        first = len(self.records)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.records = np.concatenate((self.records, records))
+        self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.records)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.sourceModel().columnCount()
+
+    def index(self, row, column, parent=QModelIndex()):
+        if parent.isValid() or not 0 <= row < len(self.records):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        return QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        if not proxy_index.isValid():
+            return QModelIndex()
+        source = self.sourceModel()
+        return source.index(source.row_for_record(int(self.records[proxy_index.row()])), proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        if not source_index.isValid():
+            return QModelIndex()
+        record, subline = self.sourceModel().locate(source_index.row())
+        row = int(np.searchsorted(self.records, record))
+        if subline or row == len(self.records) or self.records[row] != record:
+            return QModelIndex()
+        return self.index(row, source_index.column())
+
+    def locate(self, row):
+        return int(self.records[row]), 0
+
+    def record_for_row(self, row):
+        return int(self.records[row])
+
+    def row_for_record(self, record):
+        """Fila del último registro filtrado <= record (-1 si no hay)."""
+        return int(np.searchsorted(self.records, record, side="right")) - 1
+
+    def toggle_expanded(self, row):
+        return False
+
+# ------------------- DECODIFICACIÓN DE VIDEO -------------------
+
+FRAME_RING_SIZE = 8
+DROP_BEHIND_SECONDS = 0.1  # atraso del decodificador respecto del reloj a partir del cual saltea frames
+MAX_LEAD_SECONDS = 2.0  # cuánto puede apuntar por delante del reloj al saltar
+
+def letterbox_rect(frame_w, frame_h, area_w, area_h):
+    """(x, y, ancho, alto) del frame escalado para entrar centrado en area_w x area_h."""
+    scale = min(area_w / frame_w, area_h / frame_h)
+    new_w = max(1, int(frame_w * scale))
+    new_h = max(1, int(frame_h * scale))
+    return (area_w - new_w) // 2, (area_h - new_h) // 2, new_w, new_h
+
+def rgb_to_qimage(rgb_image):
+    # Sin copia: el array tiene que vivir mientras se use la imagen
+    return QImage(rgb_image.data, rgb_image.shape[1], rgb_image.shape[0],
+                  rgb_image.strides[0], QImage.Format_RGB888)
+
+def bgra_to_qimage(bgra_image):
+    # Sin copia, como rgb_to_qimage. RGB32 es el formato que Qt pinta sin convertir
+    return QImage(bgra_image.data, bgra_image.shape[1], bgra_image.shape[0],
+                  bgra_image.strides[0], QImage.Format_RGB32)
+
+class FrameScaler:
+    """Escala frames BGR al tamaño que ocupan en la vista (sin bordes: los pinta FrameView) y los
+    pasa a BGRA. La geometría y los buffers intermedios se rehacen solo cuando cambia el tamaño del
+    video o de la vista.
+
+    INTER_AREA con un factor no entero es lento (unos 14 ms para 1080p a 950x534): se reduce primero
+    por el factor entero más grande, que tiene camino rápido, y el resto se hace con INTER_LINEAR.
+
+    Con pool_size > 0 los buffers de salida se reciclan: quien termina de usar uno lo devuelve
+    con release() y el hilo que decodifica lo vuelve a llenar en vez de pedir memoria nueva."""
+
+    def __init__(self, pool_size=0):
+        self.pool_size = pool_size
+        self.target_size = (1, 1)
+        self._geometry = None
+        self._reduced = None
+        self._resized = None
+        self._free = []
+        self._lock = threading.Lock()
+
+    def set_target_size(self, width, height):
+        self.target_size = (max(1, width), max(1, height))
+
+    def release(self, bgra_image):
+        with self._lock:
+            if len(self._free) < self.pool_size and self._resized is not None \
+                    and bgra_image.shape[:2] == self._resized.shape[:2]:
+                self._free.append(bgra_image)
+
+    def _prepare(self, frame_w, frame_h):
+        geometry = (frame_w, frame_h) + self.target_size
+        if geometry != self._geometry:
+            frame_w, frame_h = geometry[:2]
+            _, _, new_w, new_h = letterbox_rect(*geometry)
+            factor = min(frame_w // new_w, frame_h // new_h)
+            with self._lock:
+                self._geometry = geometry
+                self._reduced = np.empty((frame_h // factor, frame_w // factor, 3), np.uint8) if factor >= 2 else None
+                self._resized = np.empty((new_h, new_w, 3), np.uint8)
+                self._free = []
+
+    def _acquire(self):
+        with self._lock:
+            out = self._free.pop() if self._free else None
+        if out is None:
+            out = np.empty(self._resized.shape[:2] + (4,), np.uint8)
+        return out
+
+    def output_buffer(self, frame_w, frame_h):
+        """Buffer BGRA del tamaño que ocupa en la vista un frame de frame_w x frame_h, para que lo
+        llene otro (el pipe de ffmpeg)."""
+        self._prepare(frame_w, frame_h)
+        return self._acquire()
+
+    def scale(self, img):
+        self._prepare(img.shape[1], img.shape[0])
+        resized = self._resized
+        source = img
+        if self._reduced is not None:
+            cv2.resize(img, (self._reduced.shape[1], self._reduced.shape[0]), dst=self._reduced, interpolation=cv2.INTER_AREA)
+            source = self._reduced
+        if resized.shape[:2] == source.shape[:2]:
+            resized = source
+        else:
+            cv2.resize(source, (resized.shape[1], resized.shape[0]), dst=resized, interpolation=cv2.INTER_LINEAR)
+        out = self._acquire()
+        cv2.cvtColor(resized, cv2.COLOR_BGR2BGRA, dst=out)
+        return out
+
+class FrameView(QWidget):
+    """Muestra un frame BGRA centrado y pinta de negro el resto, sin armar una imagen con bordes.
+
+    El rectángulo se recalcula solo al cambiar el tamaño del widget o del frame; si el frame es de
+    otro tamaño (se agrandó la ventana y todavía no llegó uno nuevo), Qt lo escala al pintar."""
+
+    resized = Signal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.frame = None
+        self._image = None
+        self._rect = None
+        self._bars = []
+
+    def set_frame(self, bgra_image):
+        resized = self.frame is None or self.frame.shape != bgra_image.shape
+        self.frame = bgra_image
+        self._image = bgra_to_qimage(bgra_image)
+        if resized:
+            self._update_geometry()
+        self.update()
+
+    def clear(self):
+        """Todo negro (el video todavía no empezó o ya terminó)."""
+        self.frame = self._image = None
+        self._update_geometry()
+        self.update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_geometry()
+        self.resized.emit()
+
+    def _update_geometry(self):
+        if self.frame is None:
+            self._rect, self._bars = None, [self.rect()]
+            return
+        x, y, w, h = letterbox_rect(self.frame.shape[1], self.frame.shape[0], max(1, self.width()), max(1, self.height()))
+        self._rect = QRect(x, y, w, h)
+        self._bars = [r for r in (QRect(0, 0, self.width(), y), QRect(0, y + h, self.width(), self.height() - y - h),
+                                  QRect(0, y, x, h), QRect(x + w, y, self.width() - x - w, h)) if not r.isEmpty()]
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        for bar in self._bars:
+            painter.fillRect(bar, Qt.black)
+        if self._image is not None:
+            painter.drawImage(self._rect, self._image)
+        painter.end()
+
+SEEK_COST_FRAMES = 8  # costo fijo de un cap.set, en frames decodificados
+FORWARD_FALLBACK_SECONDS = 0.5  # sin keyframes conocidos: hasta dónde conviene decodificar hacia adelante
+
+def scan_video_index(video_path, started=None):
+    """(times, keyframes) del primer stream de video, sacados de los paquetes que lista ffprobe:
+    times son los segundos de cada frame desde el primero (en orden de presentación) y keyframes
+    los números de frame de los keyframes. None si ffprobe no está, falla o lo matan.
+    started(proc) recibe el proceso de ffprobe apenas se lanza, para poder matarlo."""
+    try:
+        proc = subprocess.Popen([
+            FFPROBE_PATH, "-v", "error", "-select_streams", "v:0",
+            "-show_entries", "packet=pts_time,flags", "-of", "csv=p=0", video_path
+        ], creationflags=NO_WINDOW_FLAGS, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    except OSError:
+        return None
+    if started:
+        started(proc)
+    stdout, _ = proc.communicate()
+    if proc.returncode:
+        return None
+    pts, keys = [], []
+    for line in stdout.splitlines():
+        fields = line.split(",")
+        if len(fields) < 2:
+            continue
+        try:
+            pts.append(float(fields[0]))
+        except ValueError:  # N/A
+            continue
+        keys.append("K" in fields[-1])
+    if not pts:
+        return None
+    pts = np.array(pts, dtype=np.float64)
+    # Los paquetes vienen en orden de decodificación; el número de frame es el puesto de su pts
+    times = np.sort(pts)
+    keyframes = np.unique(np.searchsorted(times, pts[np.array(keys, dtype=bool)]))
+    return times - times[0], keyframes
+
+def save_video_index(path, index):
+    times, keyframes = index
+    with open(path, "wb") as f:
+        np.savez(f, times=times, keyframes=keyframes)
+
+def load_video_index(path):
+    with np.load(path) as z:
+        times, keyframes = z["times"], z["keyframes"]
+    if times.ndim != 1 or keyframes.ndim != 1 or not len(times):
+        raise ValueError("malformed video index")
+    return times, keyframes
+
+class VideoTimeline:
+    """Conversión entre número de frame y segundos desde el primer frame.
+
+    Con times (de scan_video_index) usa los tiempos reales de cada frame, así que sirve para videos
+    de fps variable; sin ellos supone fps constante."""
+
+    PTS_EPSILON = 1e-6  # ffprobe redondea pts_time a microsegundos (y time_of con fps no es exacto)
+
+    def __init__(self, fps, total_frames, times=None):
+        self.fps = fps
+        self.times = times if times is not None and len(times) else None
+        self.total_frames = len(self.times) if self.times is not None else total_frames
+        # Con fps variable los tiempos se apartan de frame / fps y OpenCV no sirve para buscar por número
+        self.variable = self.times is not None and bool(
+            np.abs(self.times - np.arange(len(self.times)) / fps).max() > 0.5 / fps)
+        # Ritmo de los tramos más rápidos (percentil, para no hacer caso a pts repetidos)
+        self.peak_fps = fps
+        if self.times is not None and len(self.times) > 1:
+            self.peak_fps = max(fps, 1 / max(1e-3, float(np.percentile(np.diff(self.times), 5))))
+
+    def time_of(self, frame):
+        times = self.times
+        if times is None or frame < 0:
+            return frame / self.fps
+        if frame >= len(times):
+            return float(times[-1]) + (frame - len(times) + 1) / self.fps
+        return float(times[frame])
+
+    def frame_at(self, seconds):
+        """Frame en pantalla a los seconds; -1 si todavía no empezó y total_frames si ya terminó."""
+        if seconds < 0:
+            return -1
+        if self.times is None:
+            return int((seconds + self.PTS_EPSILON) * self.fps)
+        frame = int(np.searchsorted(self.times, seconds + self.PTS_EPSILON, side="right")) - 1
+        if frame == len(self.times) - 1 and seconds >= self.duration():
+            return len(self.times)
+        return frame
+
+    def frame_duration(self, frame):
+        times = self.times
+        if times is None or not 0 <= frame < len(times) - 1:
+            return 1 / self.fps
+        return float(times[frame + 1] - times[frame])
+
+    def duration(self):
+        return self.time_of(self.total_frames)
+
+class SeekStats:
+    """Latencias en ms de FrameSeeker.read cuando no es la lectura siguiente ("forward" o "seek")."""
+
+    def __init__(self):
+        self.samples = {}
+
+    def add(self, kind, ms):
+        self.samples.setdefault(kind, []).append(ms)
+
+    def summary(self):
+        lines = []
+        for kind in ("forward", "seek"):
+            values = self.samples.get(kind)
+            if values:
+                values = np.array(values)
+                lines.append(f"{kind}: {len(values)} reads, mean {values.mean():.1f} ms, "
+                             f"p95 {np.percentile(values, 95):.1f} ms, max {values.max():.1f} ms")
+        return "\n".join(lines) or "No seeks yet"
+
+class FrameSeeker:
+    """Lee frames por número de un VideoCapture llevando la cuenta de su posición real.
+
+    Si el frame pedido está adelante y decodificar hasta él cuesta menos que un seek (que arranca
+    en el keyframe anterior), avanza con grab() en vez de cap.set.
+
+    En videos de fps variable los números de frame de OpenCV (pts * fps) no son los del índice:
+    ahí se busca por tiempo y se mira dónde quedó (ver _seek_time)."""
+
+    VFR_SEEK_ATTEMPTS = 4
+
+    def __init__(self, cap, fps, stats=None):
+        self.cap = cap
+        self.next_frame = 0  # None si no se sabe (después de un error)
+        self.keyframes = None
+        self.timeline = None
+        self.forward_limit = max(SEEK_COST_FRAMES, int(fps * FORWARD_FALLBACK_SECONDS))
+        self.stats = stats
+
+    def plan(self, frame):
+        if self.next_frame is None or frame < self.next_frame:
+            return "seek"
+        if frame == self.next_frame:
+            return "sequential"
+        distance = frame - self.next_frame
+        if self.keyframes is None or not len(self.keyframes):
+            return "forward" if distance <= self.forward_limit else "seek"
+        keyframe = self.keyframes[max(0, int(np.searchsorted(self.keyframes, frame, side="right")) - 1)]
+        if self.next_frame >= keyframe or distance <= frame - keyframe + SEEK_COST_FRAMES:
+            return "forward"
+        return "seek"
+
+    def read(self, frame, before_grab=None):
+        """before_grab(), si se pasa, se llama antes de cada grab() (puede esperar)."""
+        kind = self.plan(frame)
+        start = time.perf_counter()
+        if kind == "seek":
+            if self.timeline is not None and self.timeline.variable:
+                self._seek_time(frame)
+            else:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame)
+                self.next_frame = frame
+        ok = True
+        while ok and self.next_frame < frame:
+            if before_grab:
+                before_grab()
+            ok = self.cap.grab()
+            self.next_frame += 1
+        ret, img = self.cap.read() if ok else (False, None)
+        self.next_frame = self.next_frame + 1 if ret else None
+        if self.stats is not None and kind != "sequential":
+            self.stats.add(kind, (time.perf_counter() - start) * 1000)
+        return ret, img
+
+    def _seek_time(self, frame):
+        """Deja el VideoCapture en frame o antes (next_frame dice dónde) buscando por tiempo.
+
+        Después de un seek, POS_MSEC es el pts del último frame decodificado. Si OpenCV se pasó
+        (o el seek falló, que deja POS_MSEC en 0) se vuelve a pedir más atrás; si no, desde el principio."""
+        timeline = self.timeline
+        target = frame
+        if self.keyframes is not None and len(self.keyframes):
+            target = self.keyframes[max(0, int(np.searchsorted(self.keyframes, frame, side="right")) - 1)]
+        target_seconds = timeline.time_of(target)
+        seconds = target_seconds
+        for _ in range(self.VFR_SEEK_ATTEMPTS):
+            if seconds <= 0:
+                break
+            self.cap.set(cv2.CAP_PROP_POS_MSEC, seconds * 1000)
+            landed_seconds = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+            landed = timeline.frame_at(landed_seconds)
+            if landed_seconds > 0 and landed < frame:
+                self.next_frame = landed + 1
+                return
+            seconds -= max(1.0, landed_seconds - target_seconds)
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.next_frame = 0
+
+class VideoIndexScanner(QThread):
+    """Busca el índice del video (times, keyframes) en VIDEO_CACHE o lo saca con scan_video_index.
+
+    ffprobe lee todos los paquetes del archivo (minutos en videos largos): stop() lo mata en vez de
+    esperarlo, y un índice cortado no se guarda ni se emite."""
+
+    scanned = Signal(object)  # (times, keyframes) o None
+
+    def __init__(self, video_path, parent=None):
+        super().__init__(parent)
+        self.video_path = video_path
+        self._proc = None
+        self._lock = threading.Lock()
+
+    def run(self):
+        index = VIDEO_CACHE.lookup_index(self.video_path)
+        if index is None:
+            index = scan_video_index(self.video_path, self._started)
+            if self.isInterruptionRequested():
+                return
+            if index is not None:
+                VIDEO_CACHE.store_index(self.video_path, index)
+        self.scanned.emit(index)
+
+    def _started(self, proc):
+        with self._lock:
+            self._proc = proc
+            if self.isInterruptionRequested():
+                proc.kill()
+
+    def stop(self):
+        self.requestInterruption()
+        with self._lock:
+            if self._proc is not None and self._proc.poll() is None:
+                self._proc.kill()
+        self.wait()
+
+class FrameRing:
+    """Buffer circular acotado de frames listos entre el hilo que decodifica y la GUI.
+
+    put() espera si está lleno; get() y get_due() nunca esperan: si está vacío devuelven None y, si
+    ya había llegado algún frame desde el último clear(), cuentan un underrun. clear() cambia
+    generation para descartar los frames que se estaban decodificando antes de un seek."""
+
+    def __init__(self, capacity=FRAME_RING_SIZE):
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        self._head = 0
+        self._count = 0
+        self._cond = threading.Condition()
+        self._primed = False
+        self._last_due = -1
+        self.generation = 0
+        self.underruns = 0
+
+    def __len__(self):
+        return self._count
+
+    def put(self, item, generation, stopped=None):
+        """Devuelve False si el frame se descartó (hubo un clear o stopped() mientras esperaba)."""
+        with self._cond:
+            while self._count == self.capacity and generation == self.generation and not (stopped and stopped()):
+                self._cond.wait(0.1)
+            if generation != self.generation or self._count == self.capacity:
+                return False
+            self._slots[(self._head + self._count) % self.capacity] = item
+            self._count += 1
+            self._primed = True
+            return True
+
+    def get(self):
+        with self._cond:
+            if not self._count:
+                if self._primed:
+                    self.underruns += 1
+                return None
+            item = self._slots[self._head]
+            self._slots[self._head] = None
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            self._cond.notify_all()
+            return item
+
+    def get_due(self, due):
+        """(item, descartados): el último frame <= due y los anteriores que ya no vale la pena mostrar.
+        item es None si el ring está vacío o si el primero todavía no toca."""
+        with self._cond:
+            if not self._count:
+                # Un underrun por frame que tocaba y no estaba, no por cada vez que se pregunta
+                if self._primed and due > self._last_due:
+                    self.underruns += 1
+                    self._last_due = due
+                return None, []
+            taken = []
+            while self._count and self._slots[self._head][0] <= due:
+                taken.append(self._slots[self._head])
+                self._slots[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+                self._count -= 1
+            if taken:
+                self._last_due = max(self._last_due, taken[-1][0])
+                self._cond.notify_all()
+                return taken[-1], taken[:-1]
+            return None, []
+
+    def clear(self):
+        with self._cond:
+            self._slots = [None] * self.capacity
+            self._head = self._count = 0
+            self._primed = False
+            self._last_due = -1
+            self.generation += 1
+            self._cond.notify_all()
+
+class FrameCache:
+    """Frames ya escalados de los últimos saltos, por (frame, ancho y alto de la vista), hasta max_bytes.
+
+    Se usa solo desde la GUI; al pasarse del tope se expulsan los usados hace más tiempo."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._frames = OrderedDict()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def get(self, frame, width, height):
+        image = self._frames.get((frame, width, height))
+        if image is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._frames.move_to_end((frame, width, height))
+        return image
+
+    def put(self, frame, width, height, image):
+        if image.nbytes > self.max_bytes:
+            return
+        key = (frame, width, height)
+        old = self._frames.pop(key, None)
+        if old is not None:
+            self.nbytes -= old.nbytes
+        self._frames[key] = image
+        self.nbytes += image.nbytes
+        self._evict()
+
+    def _evict(self):
+        while self.nbytes > self.max_bytes:
+            _, evicted = self._frames.popitem(last=False)
+            self.nbytes -= evicted.nbytes
+
+    def clear(self):
+        self._frames.clear()
+        self.nbytes = 0
+
+    def set_max_bytes(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._evict()
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = f", {100 * self.hits / total:.0f}% hits" if total else ""
+        return (f"Frame cache: {len(self)} frames, {self.nbytes / 2**20:.0f} of {self.max_bytes / 2**20:.0f} MB, "
+                f"{self.hits} hits, {self.misses} misses{rate}")
+
+class PlaybackClock:
+    """Reloj de reproducción sobre time.monotonic(): en qué segundo del video (del primero, si hay
+    varios) tendría que estar la reproducción ahora.
+
+    Lo comparten todos los videos del reproductor; cada uno lo ve en sus frames con un PaneClock.
+    El origen es una sola tupla para que los otros hilos nunca lean uno a medias."""
+
+    def __init__(self):
+        self._origin = (0.0, None, 1.0)  # (segundos, momento en que estaba ahí o None si parado, velocidad)
+
+    def seconds(self, now=None):
+        seconds, start, speed = self._origin
+        if start is None:
+            return seconds
+        return seconds + ((now or time.monotonic()) - start) * speed
+
+    def running(self):
+        return self._origin[1] is not None
+
+    def start(self, seconds):
+        self._origin = (seconds, time.monotonic(), self._origin[2])
+
+    def stop(self):
+        self._origin = (self.seconds(), None, self._origin[2])
+
+    def set_speed(self, speed):
+        now = time.monotonic()
+        self._origin = (self.seconds(now), now if self.running() else None, speed)
+
+class PaneClock:
+    """El PlaybackClock visto desde un video: qué frame de ese video tendría que estar en pantalla.
+
+    La GUI lo usa para elegir qué mostrar y FrameDecoder para saltearse los frames que ya no
+    llegarían a tiempo. Pasa a frames con timeline, así en un video de fps variable sigue los
+    tiempos reales; offset es el segundo del reloj en el que empieza el video."""
+
+    def __init__(self, clock, timeline, offset=0.0):
+        self.clock = clock
+        self.timeline = timeline
+        self.offset = offset
+        self.dropped = 0  # llegaron decodificados pero tarde y no se mostraron
+        self.skipped = 0  # el decodificador ni los decodificó por ir atrasado
+        self.drift_samples = 0
+        self.drift_total_ms = 0.0
+        self.drift_max_ms = 0.0
+
+    def running(self):
+        return self.clock.running()
+
+    def frame(self):
+        return self.timeline.frame_at(self.clock.seconds() - self.offset)
+
+    def record_shown(self, frame):
+        """Anota cuánto se separa el frame mostrado (ms de video) de lo que marca el reloj."""
+        drift_ms = abs(self.timeline.time_of(frame) + self.offset - self.clock.seconds()) * 1000
+        self.drift_samples += 1
+        self.drift_total_ms += drift_ms
+        self.drift_max_ms = max(self.drift_max_ms, drift_ms)
+
+    def summary(self):
+        drift = (f"mean {self.drift_total_ms / self.drift_samples:.1f} ms, max {self.drift_max_ms:.1f} ms"
+                 if self.drift_samples else "no frames shown yet")
+        return (f"Dropped frames: {self.dropped} late, {self.skipped} skipped by the decoder\n"
+                f"Drift from the playback clock: {drift}")
+
+class FrameDecoder(QThread):
+    """Lee el video con su propio VideoCapture y deja en un FrameRing (frame, bgra) ya escalados.
+
+    Al final del video deja (frame, None). Los frames que salen del ring se devuelven con
+    scaler.release() cuando ya no se muestran. Está quieto hasta el primer seek() y después de pause().
+
+    Si tiene clock y va más de DROP_BEHIND_SECONDS atrasado, salta adelante del frame que toca: el
+    margen (lead) crece con lo que llegó tarde el salto anterior, porque grab() también decodifica y
+    en un video que no se llega a decodificar en tiempo real solo los seeks a keyframes adelantan."""
+
+    def __init__(self, video_path, ring, stats=None, clock=None, parent=None):
+        super().__init__(parent)
+        self.video_path = video_path
+        self.ring = ring
+        self.stats = stats
+        self.clock = clock
+        self.keyframes = None
+        self.timeline = None  # VideoTimeline cuando está el índice del video
+        # Buffers de sobra para los que están en el ring, el que se muestra y el que se llena
+        self.scaler = FrameScaler(ring.capacity + 2)
+        self._cond = threading.Condition()
+        self._active = False
+        self._seek_to = None
+
+    def seek(self, frame):
+        """Descarta lo decodificado y sigue desde frame."""
+        with self._cond:
+            self._seek_to = frame
+            self._active = True
+            self.ring.clear()
+            self._cond.notify_all()
+
+    def pause(self):
+        with self._cond:
+            self._active = False
+            self.ring.clear()
+
+    def set_target_size(self, width, height):
+        self.scaler.set_target_size(width, height)
+
+    def stop(self):
+        self.requestInterruption()
+        with self._cond:
+            self._cond.notify_all()
+        self.wait()
+
+    # Lectura con OpenCV; FfmpegFrameDecoder reemplaza estos tres métodos
+
+    def open(self):
+        """Abre el video y devuelve sus fps."""
+        self.cap = cv2.VideoCapture(self.video_path)
+        fps = max(1.0, self.cap.get(cv2.CAP_PROP_FPS))
+        self.seeker = FrameSeeker(self.cap, fps, self.stats)
+        return fps
+
+    def read_frame(self, frame):
+        """El frame ya escalado (un buffer del pool de scaler) o None si no hay más video."""
+        self.seeker.keyframes = self.keyframes
+        self.seeker.timeline = self.timeline
+        ret, img = self.seeker.read(frame)
+        return self.scaler.scale(img) if ret else None
+
+    def close(self):
+        self.cap.release()
+
+    def run(self):
+        fps = self.open()
+        behind_limit = max(1, int(fps * DROP_BEHIND_SECONDS))
+        position = 0
+        lead = 0
+        try:
+            while not self.isInterruptionRequested():
+                with self._cond:
+                    while not self._active and not self.isInterruptionRequested():
+                        self._cond.wait()
+                    seek, self._seek_to = self._seek_to, None
+                    generation = self.ring.generation
+                if self.isInterruptionRequested():
+                    break
+                if seek is not None:
+                    position = seek
+                jumped = False
+                if self.clock is not None and self.clock.running():
+                    due = self.clock.frame()
+                    if due - position > behind_limit:
+                        # Los intermedios se avanzan sin convertir ni escalar (o con un seek)
+                        target = due + lead
+                        self.clock.skipped += target - position
+                        position = target
+                        jumped = True
+                image = self.read_frame(position)
+                if jumped:
+                    late = self.clock.frame() - position
+                    lead = min(int(fps * MAX_LEAD_SECONDS), max(0, lead + late))
+                if image is None:
+                    self.ring.put((position, None), generation, self.isInterruptionRequested)
+                    with self._cond:
+                        if self._seek_to is None:
+                            self._active = False
+                    continue
+                self.ring.put((position, image), generation, self.isInterruptionRequested)
+                position += 1
+        finally:
+            self.close()
+
+class FfmpegPipe:
+    """Un ffmpeg que decodifica desde un frame, escala a width x height y pasa a BGRA, y manda los
+    frames crudos por stdout. Escalar antes de convertir, y en el proceso de ffmpeg, es lo que
+    ahorra CPU con videos mucho más grandes que la vista (4K en media pantalla)."""
+
+    def __init__(self, video_path, start, frame, width, height):
+        """start: segundos entre el frame anterior y frame, así con el seek exacto de ffmpeg el
+        primero que sale es justo frame."""
+        self.size = (width, height)
+        self.next_frame = frame
+        self.proc = subprocess.Popen([
+            FFMPEG_PATH, "-hide_banner", "-v", "error", "-nostdin", "-ss", f"{start:.6f}", "-i", video_path,
+            "-an", "-sn", "-dn", "-vf", f"scale={width}:{height}:flags=area", "-pix_fmt", "bgra",
+            "-fps_mode", "passthrough", "-f", "rawvideo", "pipe:1"
+        ], creationflags=NO_WINDOW_FLAGS, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, bufsize=0)
+
+    def read_into(self, out):
+        """Llena out con el próximo frame; False si ffmpeg terminó antes."""
+        view = memoryview(out).cast("B")
+        got = 0
+        while got < len(view):
+            n = self.proc.stdout.readinto(view[got:])
+            if not n:
+                return False
+            got += n
+        self.next_frame += 1
+        return True
+
+    def close(self):
+        self.proc.kill()
+        self.proc.wait()
+        self.proc.stdout.close()
+
+class FfmpegFrameDecoder(FrameDecoder):
+    """FrameDecoder que lee de un FfmpegPipe al tamaño de la vista en vez de OpenCV.
+
+    El pipe se relanza en un seek que no conviene hacer leyendo hacia adelante (misma cuenta que
+    FrameSeeker) y cuando cambia el tamaño de la vista."""
+
+    def open(self):
+        cap = cv2.VideoCapture(self.video_path)
+        fps = max(1.0, cap.get(cv2.CAP_PROP_FPS))
+        self.frame_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        cap.release()
+        self.fps = fps
+        self.planner = FrameSeeker(None, fps)  # solo para plan()
+        self.pipe = None
+        self._discard = None
+        return fps
+
+    def read_frame(self, frame):
+        out = self.scaler.output_buffer(*self.frame_size)
+        size = (out.shape[1], out.shape[0])
+        kind = "sequential"
+        if self.pipe is not None:
+            self.planner.keyframes = self.keyframes
+            self.planner.next_frame = self.pipe.next_frame
+            kind = self.planner.plan(frame)
+        start = time.perf_counter()
+        if self.pipe is None or self.pipe.size != size or kind == "seek":
+            self.close()
+            try:
+                timeline = self.timeline or VideoTimeline(self.fps, 0)
+                start = (timeline.time_of(frame - 1) + timeline.time_of(frame)) / 2 if frame > 0 else 0.0
+                self.pipe = FfmpegPipe(self.video_path, start, frame, *size)
+            except OSError as e:
+                print("Error starting ffmpeg decoder:", e)
+                return None
+        elif kind == "forward":
+            if self._discard is None or self._discard.shape != out.shape:
+                self._discard = np.empty_like(out)
+            while self.pipe.next_frame < frame:
+                if not self.pipe.read_into(self._discard):
+                    return None
+        ok = self.pipe.read_into(out)
+        if self.stats is not None and kind != "sequential":
+            self.stats.add(kind, (time.perf_counter() - start) * 1000)
+        return out if ok else None
+
+    def close(self):
+        if self.pipe is not None:
+            self.pipe.close()
+            self.pipe = None
+
+def ffmpeg_available():
+    """True si está el ffmpeg incluido. En Windows es ffmpeg.exe: shutil.which no prueba PATHEXT en
+    rutas con carpeta."""
+    return any(os.path.isfile(path) for path in (FFMPEG_PATH, FFMPEG_PATH + ".exe"))
+
+def make_frame_decoder(video_path, ring, stats=None, clock=None, parent=None):
+    """FrameDecoder según "video_decoder" en settings: "opencv", "ffmpeg" o "auto" (ffmpeg si está y
+    el video es más grande que 1080p, donde decodificar y escalar con OpenCV no llega)."""
+    choice = SETTINGS.get("video_decoder") or "auto"
+    use_ffmpeg = choice == "ffmpeg"
+    if choice == "auto" and ffmpeg_available():
+        cap = cv2.VideoCapture(video_path)
+        pixels = cap.get(cv2.CAP_PROP_FRAME_WIDTH) * cap.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        cap.release()
+        use_ffmpeg = pixels > 1920 * 1080
+    cls = FfmpegFrameDecoder if use_ffmpeg else FrameDecoder
+    return cls(video_path, ring, stats, clock, parent)
 
-from pyupdater.client import Client
-import requests
+class SeekWorker(QThread):
+    """Decodifica los frames sueltos que pide la GUI (scroll y click en logs, slider, saltos).
 
-class AppClient(Client):
-    APP_NAME = "Synclogs"
-    COMPANY_NAME = "KovaTools"
-    HTTP_TIMEOUT = 30
-    MAX_DOWNLOAD_RETRIES = 3
-    
-def check_for_update(current_version: str):
-    try:
-        url = "https://api.github.com/repos/gamartin23/Lupi/releases/latest"
-        resp = requests.get(url, timeout=5).json()
-        
-        latest_version = resp["tag_name"].lstrip("v")
-        assets = resp.get("assets", [])
-        
-        from packaging import version
-        if version.parse(latest_version) > version.parse(current_version):
-            if assets:
-                download_url = assets[0]["browser_download_url"]
-                return latest_version, download_url
-        return None, None
-    except Exception as e:
-        print("Error checking updates:", e)
-        return None, None
+    Solo se guarda el último pedido: los que llegan mientras decodifica reemplazan al pendiente,
+    así un scroll rápido termina en el frame donde quedó sin hacer cola."""
 
-LOG_PATH = ''
-VIDEO_PATH = ''
+    frame_ready = Signal(int, int, int, object)  # número de frame, tamaño de la vista pedido, bgra ya escalado
 
-def resource_path(relative_path):
-    if hasattr(sys, "_MEIPASS"):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.abspath(".")
-    return os.path.join(base_path, relative_path)
+    def __init__(self, video_path, stats=None, parent=None):
+        super().__init__(parent)
+        self.video_path = video_path
+        self.stats = stats
+        self.keyframes = None
+        self.timeline = None
+        self.scaler = FrameScaler()  # sin reciclar: los frames quedan en FrameCache
+        self.requests = 0
+        self.dropped = 0
+        self.busy = False  # hay un pedido pendiente o decodificándose
+        self._cond = threading.Condition()
+        self._pending = None
 
-LOG_ICON_PATH = resource_path("img/logs.png")  
-VIDEO_ICON_PATH = resource_path("img/video.png")
-PLAY_ICON_PATH = resource_path("img/play.png") 
-PAUSE_ICON_PATH = resource_path("img/pause.png")
-RESTART_ICON_PATH = resource_path("img/restart.png")
-END_ICON_PATH = resource_path("img/end.png")
-PLUS2_ICON_PATH = resource_path("img/plus2.png")
-MINUS2_ICON_PATH = resource_path("img/minus2.png")
-ONEX_ICON_PATH = resource_path("img/1x.png")
-HALFX_ICON_PATH = resource_path("img/point5.png")
-POINT2X_ICON_PATH = resource_path("img/point2.png")
-APPICON = resource_path("img/synclogs128.ico")
-ver = "1.7"
+    def request(self, frame):
+        with self._cond:
+            self.requests += 1
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = frame
+            self.busy = True
+            self._cond.notify_all()
 
+    def set_target_size(self, width, height):
+        self.scaler.set_target_size(width, height)
 
-# ------------------- UTILIDADES -------------------
+    def stop(self):
+        self.requestInterruption()
+        with self._cond:
+            self._cond.notify_all()
+        self.wait()
 
-def get_file_creation_time_utc(path):
-    ts = os.path.getctime(path)
-    return datetime.datetime.utcfromtimestamp(ts)
+    def run(self):
+        cap = cv2.VideoCapture(self.video_path)
+        seeker = FrameSeeker(cap, cap.get(cv2.CAP_PROP_FPS), self.stats)
+        try:
+            while True:
+                with self._cond:
+                    while self._pending is None and not self.isInterruptionRequested():
+                        self._cond.wait()
+                    if self.isInterruptionRequested():
+                        break
+                    frame, self._pending = self._pending, None
+                seeker.keyframes = self.keyframes
+                seeker.timeline = self.timeline
+                ret, img = seeker.read(frame)
+                if ret:
+                    target_size = self.scaler.target_size
+                    self.frame_ready.emit(frame, *target_size, self.scaler.scale(img))
+                with self._cond:
+                    self.busy = self._pending is not None
+        finally:
+            cap.release()
 
-def parse_logs(log_file):
-    logs = []
-    original_lines = []
-    pattern = re.compile(r"\[(\d{4}\.\d{2}\.\d{2})-(\d{2}\.\d{2}\.\d{2}):(\d+)\]")
-    with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            original_lines.append(line.rstrip("\n"))
-            match = pattern.search(line)
-            if match:
-                date_str = match.group(1).replace(".", "-")
-                time_str = match.group(2).replace(".", ":")
-                ms_str = match.group(3)
-                log_time = datetime.datetime.strptime(
-                    f"{date_str} {time_str}.{ms_str}",
-                    "%Y-%m-%d %H:%M:%S.%f"
-                )
-                logs.append((log_time, line.strip()))
-    return logs, original_lines
+# ------------------- MINIATURAS -------------------
 
-def export_analysis(player, out_path, progress_dialog=None):
-    tmpdir = tempfile.mkdtemp()
+THUMB_WIDTH = 160
+THUMB_INTERVAL_SECONDS = 1.0
+THUMB_MAX_TILES = 600  # videos largos: se espacian más las muestras
+THUMB_COLUMNS = 25
+THUMB_JPEG_QUALITY = 80
+VIDEO_CACHE_BYTES = 256 * 1024 * 1024
+THUMB_IDLE_SECONDS = 1.0  # el armado de miniaturas espera a que la GUI no pida frames por este tiempo
 
-    if progress_dialog:
-        progress_dialog.update_step(1, "Reencoding video...")
-    recoded_video_path = os.path.join(tmpdir, "video.mp4")
-    subprocess.run([
-        "ffmpeg_binaries/bin/ffmpeg", "-hide_banner", "-y", "-i", player.video_path,
-        "-b:v", "2M", "-preset", "fast", "-c:a", "aac",
-        recoded_video_path
-    ], creationflags=subprocess.CREATE_NO_WINDOW, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+class ThumbnailSheet:
+    """Miniaturas del video cada interval segundos, en una sola imagen RGB (grilla de columns).
 
-    if progress_dialog:
-        progress_dialog.update_step(2, "Saving logs...")
-    logs_path = os.path.join(tmpdir, "logs.txt")
-    with open(logs_path, "w", encoding="utf-8") as f:
-        f.write("\n".join(player.original_logs))
+    ThumbnailBuilder la va llenando desde otro hilo; count dice cuántas ya están listas."""
 
-    if progress_dialog:
-        progress_dialog.update_step(3, "Saving metadata...")
-    meta = {
-        "video_start_time": player.video_start_time.isoformat(),
-        "fps": player.fps,
-        "total_frames": player.total_frames
-    }
-    meta_path = os.path.join(tmpdir, "meta.json")
-    with open(meta_path, "w", encoding="utf-8") as f:
-        json.dump(meta, f)
+    def __init__(self, interval, tile_w, tile_h, total, image=None, count=0):
+        self.interval = interval
+        self.tile_w = tile_w
+        self.tile_h = tile_h
+        self.total = total
+        self.columns = min(THUMB_COLUMNS, max(1, total))
+        rows = -(-total // self.columns)
+        self.image = image if image is not None else np.zeros((rows * tile_h, self.columns * tile_w, 3), np.uint8)
+        self.count = count
 
-    if progress_dialog:
-        progress_dialog.update_step(4, "Creating cat crate...")
-    with zipfile.ZipFile(out_path, "w", zipfile.ZIP_DEFLATED) as z:
-        z.write(recoded_video_path, "video.mp4")
-        z.write(logs_path, "logs.txt")
-        z.write(meta_path, "meta.json")
+    @classmethod
+    def for_video(cls, total_frames, fps, frame_w, frame_h):
+        duration = total_frames / fps
+        interval = max(THUMB_INTERVAL_SECONDS, duration / THUMB_MAX_TILES)
+        tile_h = max(1, round(THUMB_WIDTH * frame_h / max(1, frame_w)))
+        return cls(interval, THUMB_WIDTH, tile_h, max(1, int(duration / interval) + 1))
 
-def import_analysis(lupi_path):
-    """Extrae un .lupi y devuelve (video_path, logs, original_logs, video_start_time, fps)."""
-    tmpdir = tempfile.mkdtemp()
+    def complete(self):
+        return self.count >= self.total
 
-    with zipfile.ZipFile(lupi_path, "r") as z:
-        z.extractall(tmpdir)
+    def tile_view(self, index):
+        row, col = divmod(index, self.columns)
+        return self.image[row * self.tile_h:(row + 1) * self.tile_h, col * self.tile_w:(col + 1) * self.tile_w]
 
-    video_path = os.path.join(tmpdir, "video.mp4")
-    logs_path = os.path.join(tmpdir, "logs.txt")
-    meta_path = os.path.join(tmpdir, "meta.json")
+    def tile(self, seconds):
+        """Miniatura más cercana a seconds (array contiguo) o None si todavía no está."""
+        index = min(self.total - 1, max(0, int(seconds / self.interval + 0.5)))
+        if index >= self.count:
+            return None
+        return np.ascontiguousarray(self.tile_view(index))
 
-    # Metadata
-    with open(meta_path, "r", encoding="utf-8") as f:
-        meta = json.load(f)
-    video_start_time = datetime.datetime.fromisoformat(meta["video_start_time"])
-    fps = meta["fps"]
+    def meta(self):
+        return {"interval": self.interval, "tile_w": self.tile_w, "tile_h": self.tile_h, "total": self.total}
 
-    # Logs originales
-    with open(logs_path, "r", encoding="utf-8") as f:
-        original_logs = [line.rstrip("\n") for line in f]
-
-    # Reparsear logs
-    logs = []
-    pattern = re.compile(r"\[(\d{4}\.\d{2}\.\d{2})-(\d{2}\.\d{2}\.\d{2}):(\d+)\]")
-    for line in original_logs:
-        match = pattern.search(line)
-        if match:
-            date_str = match.group(1).replace(".", "-")
-            time_str = match.group(2).replace(".", ":")
-            ms_str = match.group(3)
-            log_time = datetime.datetime.strptime(
-                f"{date_str} {time_str}.{ms_str}",
-                "%Y-%m-%d %H:%M:%S.%f"
-            )
-            logs.append((log_time, line.strip()))
-
-    return video_path, logs, original_logs, video_start_time, fps
+    def save(self, jpg_path, json_path):
+        ok, data = cv2.imencode(".jpg", cv2.cvtColor(self.image, cv2.COLOR_RGB2BGR),
+                                [cv2.IMWRITE_JPEG_QUALITY, THUMB_JPEG_QUALITY])
+        if not ok:
+            raise ValueError("could not encode thumbnails")
+        with open(jpg_path, "wb") as f:
+            f.write(data.tobytes())
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(self.meta(), f)
 
-def open_lupi_from_cold(from_file=None):
-    path = from_file
-    title = str(os.path.basename(path))
-    if path:
-        video_path, logs, original_logs, video_start_time, fps = import_analysis(path)
-        player = LogVideoPlayer(video_path, logs, original_logs, video_start_time, fps, title)
-        player.showMaximized()
+    @classmethod
+    def load(cls, jpg_path, json_path):
+        with open(json_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        img = cv2.imread(jpg_path, cv2.IMREAD_COLOR)
+        if img is None:
+            raise ValueError(f"could not read {jpg_path}")
+        sheet = cls(meta["interval"], meta["tile_w"], meta["tile_h"], meta["total"], cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if sheet.image.shape != (-(-sheet.total // sheet.columns) * sheet.tile_h, sheet.columns * sheet.tile_w, 3):
+            raise ValueError("thumbnail sheet size does not match its metadata")
+        sheet.count = sheet.total
+        return sheet
+
+class VideoCache:
+    """Lo que se saca de cada video y conviene no repetir, en CACHE_DIR/video: la hoja de miniaturas
+    (<clave>.jpg y .json) y el índice de tiempos y keyframes (<clave>.npz).
+
+    La clave sale del tamaño y un hash del principio y el final del video, no de la ruta: así
+    también sirve para los videos que se extraen de un .lupi a una carpeta temporal."""
+
+    PROBE = 64 * 1024
+    SUFFIXES = (".jpg", ".json", ".npz")
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+
+    def base_path(self, video_path):
+        size = os.path.getsize(video_path)
+        with open(video_path, "rb") as f:
+            head = f.read(self.PROBE)
+            f.seek(max(0, size - self.PROBE))
+            tail = f.read(self.PROBE)
+        key = hashlib.sha1(f"{size}|".encode("utf-8") + head + tail).hexdigest()[:24]
+        return os.path.join(self.root, key)
+
+    def thumbnail_paths(self, video_path):
+        base = self.base_path(video_path)
+        return base + ".jpg", base + ".json"
+
+    def index_path(self, video_path):
+        return self.base_path(video_path) + ".npz"
+
+    def lookup_thumbnails(self, video_path):
+        try:
+            jpg_path, json_path = self.thumbnail_paths(video_path)
+            if not os.path.exists(json_path):
+                return None
+            sheet = ThumbnailSheet.load(jpg_path, json_path)
+            os.utime(json_path)  # LRU
+            return sheet
+        except (OSError, ValueError, KeyError) as e:
+            print("Error reading cached thumbnails:", e)
+            return None
+
+    def store_thumbnails(self, video_path, sheet=None, files=None):
+        """Guarda sheet, o copia files (jpg, json) ya hechos, por ejemplo los de un .lupi."""
+        try:
+            jpg_path, json_path = self.thumbnail_paths(video_path)
+            os.makedirs(self.root, exist_ok=True)
+            if files:
+                shutil.copyfile(files[0], jpg_path)
+                shutil.copyfile(files[1], json_path)
+            else:
+                sheet.save(jpg_path, json_path)
+        except (OSError, ValueError) as e:
+            print("Error saving thumbnails:", e)
+            return
+        self.evict()
+
+    def lookup_index(self, video_path):
+        try:
+            path = self.index_path(video_path)
+            if not os.path.exists(path):
+                return None
+            index = load_video_index(path)
+            os.utime(path)  # LRU
+            return index
+        except (OSError, ValueError, KeyError) as e:
+            print("Error reading cached video index:", e)
+            return None
+
+    def store_index(self, video_path, index=None, file=None):
+        """Guarda index (times, keyframes), o copia file, un .npz ya hecho (el de un .lupi)."""
+        try:
+            path = self.index_path(video_path)
+            os.makedirs(self.root, exist_ok=True)
+            if file:
+                shutil.copyfile(file, path)
+            else:
+                save_video_index(path, index)
+        except (OSError, ValueError) as e:
+            print("Error saving video index:", e)
+            return
+        self.evict()
+
+    def evict(self):
+        """Borra los videos usados hace más tiempo (todos sus archivos juntos) hasta entrar en max_bytes."""
+        entries = {}
+        try:
+            for entry in os.scandir(self.root):
+                base, suffix = os.path.splitext(entry.path)
+                if suffix in self.SUFFIXES:
+                    stat = entry.stat()
+                    used, size = entries.get(base, (0.0, 0))
+                    entries[base] = (max(used, stat.st_mtime), size + stat.st_size)
+        except OSError:
+            return
+        total = sum(size for _, size in entries.values())
+        for (_, size), base in sorted((value, base) for base, value in entries.items()):
+            if total <= self.max_bytes:
+                break
+            for suffix in self.SUFFIXES:
+                try:
+                    os.remove(base + suffix)
+                except OSError:
+                    pass
+            total -= size
+
+VIDEO_CACHE = VideoCache(os.path.join(CACHE_DIR, "video"), VIDEO_CACHE_BYTES)
+
+class ThumbnailBuilder(QThread):
+    """Llena un ThumbnailSheet leyendo el video con su propio VideoCapture, en orden.
+
+    Compite por CPU con los saltos y la reproducción: espera mientras busy() sea verdadero y hasta
+    THUMB_IDLE_SECONDS después del último defer()."""
+
+    def __init__(self, video_path, sheet, timeline, keyframes=None, busy=None, parent=None):
+        super().__init__(parent)
+        self.video_path = video_path
+        self.sheet = sheet
+        self.timeline = timeline
+        self.keyframes = keyframes
+        self.busy = busy
+        self._resume_at = 0.0
+
+    def defer(self):
+        self._resume_at = time.monotonic() + THUMB_IDLE_SECONDS
+
+    def wait_idle(self):
+        while not self.isInterruptionRequested():
+            if self.busy and self.busy():
+                self.defer()
+            delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            self.msleep(int(min(delay, 0.1) * 1000) + 1)
+
+    def run(self):
+        cap = cv2.VideoCapture(self.video_path)
+        fps = max(1.0, cap.get(cv2.CAP_PROP_FPS))
+        last_frame = max(0, self.timeline.total_frames - 1)
+        seeker = FrameSeeker(cap, fps)
+        seeker.keyframes = self.keyframes
+        seeker.timeline = self.timeline
+        sheet = self.sheet
+        try:
+            for index in range(sheet.total):
+                self.wait_idle()
+                if self.isInterruptionRequested():
+                    return
+                frame = min(last_frame, self.timeline.frame_at(index * sheet.interval))
+                ret, img = seeker.read(frame, self.wait_idle)
+                if ret:
+                    sheet.tile_view(index)[:] = cv2.cvtColor(
+                        cv2.resize(img, (sheet.tile_w, sheet.tile_h), interpolation=cv2.INTER_AREA), cv2.COLOR_BGR2RGB)
+                elif index:
+                    # El video tenía menos frames de los que decía: se repite la última miniatura
+                    sheet.tile_view(index)[:] = sheet.tile_view(index - 1)
+                sheet.count = index + 1
+        finally:
+            cap.release()
+
+class PreviewSlider(QSlider):
+    """QSlider que avisa sobre qué valor está el mouse (hovered) y cuándo sale (left)."""
+
+    hovered = Signal(int, int)  # valor, x en el slider
+    left = Signal()
+
+    def __init__(self, orientation, parent=None):
+        super().__init__(orientation, parent)
+        self.setMouseTracking(True)
+
+    def value_at(self, x):
+        return QStyle.sliderValueFromPosition(self.minimum(), self.maximum(), x, max(1, self.width()))
+
+    def x_for_value(self, value):
+        return QStyle.sliderPositionFromValue(self.minimum(), self.maximum(), value, max(1, self.width()))
+
+    def mouseMoveEvent(self, event):
+        super().mouseMoveEvent(event)
+        if not self.isSliderDown():
+            x = int(event.position().x())
+            self.hovered.emit(self.value_at(x), x)
+
+    def leaveEvent(self, event):
+        super().leaveEvent(event)
+        self.left.emit()
 
 # ------------------- REPRODUCTOR -------------------
 
+class VideoPane(QObject):
+    """Un video del reproductor: su vista, su SeekWorker y su FrameDecoder (cada uno en su hilo),
+    su caché de frames y su índice. Todos los videos siguen el mismo PlaybackClock; offset es el
+    segundo del reloj en el que empieza este (0 para el primero)."""
+
+    ENDED = -1  # update(): el video terminó
+    indexed = Signal(object)  # llegó el índice del video (keyframes o None)
+
+    def __init__(self, video_path, clock, offset=0.0, fps=None, frame_cache_bytes=0, parent=None):
+        super().__init__(parent)
+        self.video_path = video_path
+        self.offset = offset
+        cap = cv2.VideoCapture(video_path)
+        self.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.fps = fps or max(1.0, cap.get(cv2.CAP_PROP_FPS))
+        self.frame_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        cap.release()
+        # fps constante hasta que VideoIndexScanner trae los tiempos reales (set_video_index)
+        self.timeline = VideoTimeline(self.fps, self.total_frames)
+        self.clock = PaneClock(clock, self.timeline, offset)
+        self.playing = False
+        self.seek_stats = SeekStats()
+        # Los frames sueltos (seeks) se decodifican en otro hilo y llegan por show_decoded_frame
+        self.seek_worker = SeekWorker(video_path, self.seek_stats, self)
+        self.seek_worker.frame_ready.connect(self.show_decoded_frame)
+        self.frame_cache = FrameCache(frame_cache_bytes)
+        self.requested_frame = None
+        self.displayed_frame = None
+        self.pooled_frame = None  # frame del FrameDecoder en pantalla (su buffer se recicla)
+        # Reproducción: otro hilo decodifica y deja los frames en frame_ring; la GUI solo los muestra
+        self.frame_ring = FrameRing()
+        self.frame_decoder = make_frame_decoder(video_path, self.frame_ring, self.seek_stats, self.clock, self)
+        self.video_index_scanner = VideoIndexScanner(video_path, self)
+        self.video_index_scanner.scanned.connect(self.set_video_index)
+
+        self.view = FrameView()
+        self.view.setMinimumWidth(220)
+        self.view.setToolTip(os.path.basename(video_path))
+        # Al arrastrar el borde de la ventana llegan muchos tamaños: el decodificador recibe el último
+        # (con ffmpeg cambiar de tamaño relanza el proceso)
+        self.view_resize_timer = QTimer(self)
+        self.view_resize_timer.setSingleShot(True)
+        self.view_resize_timer.setInterval(200)
+        self.view_resize_timer.timeout.connect(self.apply_view_size)
+        self.view.resized.connect(self.view_resize_timer.start)
+
+    def start(self):
+        self.seek_worker.start()
+        self.frame_decoder.start()
+        self.video_index_scanner.start()
+
+    def stop(self):
+        self.frame_decoder.stop()
+        self.seek_worker.stop()
+        self.video_index_scanner.stop()
+
+    def frame_at(self, seconds):
+        """Frame de este video a los seconds del reloj (-1 antes de que empiece, total_frames después)."""
+        return self.timeline.frame_at(seconds - self.offset)
+
+    def clock_seconds(self, frame):
+        return self.timeline.time_of(frame) + self.offset
+
+    def view_size(self):
+        return max(1, self.view.width()), max(1, self.view.height())
+
+    def request(self, frame):
+        """Pide el frame al SeekWorker sin esperarlo (o lo saca de la caché). False si está fuera del video."""
+        if frame < 0 or (self.total_frames and frame >= self.total_frames):
+            return False
+        self.requested_frame = frame
+        width, height = self.view_size()
+        image = self.frame_cache.get(frame, width, height)
+        if image is not None:
+            self.show_decoded_frame(frame, width, height, image)
+        else:
+            self.seek_worker.set_target_size(width, height)
+            self.seek_worker.request(frame)
+        return True
+
+    def show_decoded_frame(self, frame_number, width, height, image):
+        self.frame_cache.put(frame_number, width, height, image)
+        # Mientras se reproduce manda frame_ring; un frame viejo del SeekWorker no pisa uno más nuevo
+        if self.playing or frame_number != self.requested_frame:
+            return
+        self.show_frame(frame_number, image)
+
+    def show_frame(self, frame_number, image, pooled=False):
+        """Pone image en la vista; pooled si vino del FrameDecoder y hay que devolverle el buffer."""
+        if self.pooled_frame is not None:
+            self.frame_decoder.scaler.release(self.pooled_frame)
+        self.pooled_frame = image if pooled else None
+        self.view.set_frame(image)
+        self.displayed_frame = frame_number
+
+    def clear(self):
+        if self.pooled_frame is not None:
+            self.frame_decoder.scaler.release(self.pooled_frame)
+        self.pooled_frame = None
+        self.requested_frame = self.displayed_frame = None
+        self.view.clear()
+
+    def play(self, frame):
+        """Reproduce desde frame (si el video todavía no empezó, deja listo el primero)."""
+        self.playing = True
+        self.frame_decoder.set_target_size(*self.view_size())
+        self.frame_decoder.seek(max(0, frame))
+
+    def pause(self):
+        self.playing = False
+        self.frame_decoder.pause()
+
+    def update(self):
+        """Muestra el frame que toca según el reloj. Devuelve su número, None si queda el que
+        estaba (todavía no toca el próximo o el decodificador va atrasado) o ENDED."""
+        item, late = self.frame_ring.get_due(self.clock.frame())
+        for _, dropped_image in late:
+            if dropped_image is not None:
+                self.frame_decoder.scaler.release(dropped_image)
+        self.clock.dropped += len(late)
+        if item is None:
+            return None
+        frame_number, image = item
+        if image is None:
+            self.pause()
+            return self.ENDED
+        self.show_frame(frame_number, image, pooled=True)
+        self.clock.record_shown(frame_number)
+        return frame_number
+
+    def apply_view_size(self):
+        self.frame_decoder.set_target_size(*self.view_size())
+
+    def set_video_index(self, index):
+        """Llega de VideoIndexScanner: con los tiempos reales de los frames cambian las cuentas de
+        frame a segundos (importa en videos de fps variable) y los saltos usan los keyframes."""
+        keyframes = None
+        if index is not None:
+            times, keyframes = index
+            self.timeline = VideoTimeline(self.fps, self.total_frames, times)
+            self.clock.timeline = self.timeline
+            self.frame_decoder.timeline = self.timeline
+            self.seek_worker.timeline = self.timeline
+            self.total_frames = self.timeline.total_frames
+        self.seek_worker.keyframes = keyframes
+        self.frame_decoder.keyframes = keyframes
+        self.indexed.emit(keyframes)
+
+    def summary(self):
+        keyframes = self.seek_worker.keyframes
+        if keyframes is None:
+            gop = "Keyframes: unknown (ffprobe not available)"
+        else:
+            gop = f"Keyframes: {len(keyframes)}, average GOP {self.total_frames / max(1, len(keyframes)):.0f} frames"
+        return (f"{gop}\nDecode underruns: {self.frame_ring.underruns}\n"
+                f"Seek requests: {self.seek_worker.requests}, skipped as stale: {self.seek_worker.dropped}\n"
+                f"{self.clock.summary()}\n"
+                f"{self.frame_cache.summary()}\n\n"
+                f"{self.seek_stats.summary()}")
+
 class LogVideoPlayer(QMainWindow):
-    def __init__(self, video_path, log_path_or_logs, original_logs=None, video_start_time=None, fps=None, title=None):
+    def __init__(self, video_path, log_path_or_logs, video_start_time=None, fps=None, title=None):
         super().__init__()
         self.video_path = video_path
         self.log_path = log_path_or_logs
         self.prevIdx = None
         
-        if isinstance(log_path_or_logs, list) and original_logs is not None:
+        # Videos: el primero maneja el slider, las miniaturas y la línea resaltada del log; los que
+        # se agregan (add_video) lo siguen con el mismo reloj, cada uno con sus hilos
+        self.log_loader = None
+        self.export_worker = None
+        self.clock = PlaybackClock()
+        self.panes = [VideoPane(video_path, self.clock, 0.0, fps, self.frame_cache_bytes(1), self)]
+        self.fps = self.primary.fps
+        self.position = 0  # próximo frame a mostrar (del primer video)
+        # Miniaturas para el slider: de la caché (o del .lupi) o se arman cuando está el índice del video
+        self.thumbnails = VIDEO_CACHE.lookup_thumbnails(video_path)
+        if self.thumbnails is None:
+            self.thumbnails = ThumbnailSheet.for_video(max(1, self.total_frames), self.fps, *self.primary.frame_size)
+        self.thumbnail_builder = None
+
+        if isinstance(log_path_or_logs, (LogRecords, MergedLogRecords)):
             # Modo desde .lupi
             self.logs = log_path_or_logs
-            self.original_logs = original_logs
             self.video_start_time = video_start_time
-            self.fps = fps
             self.title = f" | {title}"
             self.setWindowTitle(f"Lupi{self.title}")
         else:
-            # Modo normal desde archivos
-            self.logs, self.original_logs = parse_logs(log_path_or_logs)
+            # Modo normal desde archivos: el log se parsea en segundo plano (ver start_log_loader).
+            # Varios logs llegan como lista de (ruta, offset en ms) y se combinan en un timeline
+            if isinstance(log_path_or_logs, str):
+                self.logs = LogRecords(LogSource(log_path_or_logs), HIGHLIGHTER)
+            else:
+                self.logs = MergedLogRecords.from_files(
+                    [(path, offset, os.path.basename(path)) for path, offset in log_path_or_logs], HIGHLIGHTER)
             self.video_start_time = get_file_creation_time_utc(video_path)
-            self.fps = max(1.0, cv2.VideoCapture(video_path).get(cv2.CAP_PROP_FPS))
             self.title = ""
             self.setWindowTitle(f"Lupi{self.title}")
             self.setWindowIcon(QIcon(APPICON))
@@ -205,14 +3269,6 @@ class LogVideoPlayer(QMainWindow):
         self.slider_dragging = False
         self.last_highlight_index = -1
         self.syncing_from_logs = False  # evita bucles
-        
-        # Video
-        self.cap = cv2.VideoCapture(video_path)
-        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
-
-        # Logs
-        self.log_times = [t for t, _ in self.logs]
-        self.log_lines = [s for _, s in self.logs]
 
         # ---------- UI ----------
         menubar = QMenuBar(self)
@@ -232,6 +3288,10 @@ class LogVideoPlayer(QMainWindow):
         file_menu.addAction(open_lupi_action)
         self.setMenuBar(menubar)
 
+        add_video_action = QAction("Add video...", self)
+        add_video_action.triggered.connect(self.select_extra_video)
+        file_menu.addAction(add_video_action)
+
         export_action = QAction("Export synced logs", self)
         export_action.triggered.connect(self.export_current_analysis)
         file_menu.addAction(export_action)
@@ -240,6 +3300,17 @@ class LogVideoPlayer(QMainWindow):
         exit_action.triggered.connect(QApplication.instance().quit)
         file_menu.addAction(exit_action)        
                 
+        view_menu = QMenu("View", self)
+        menubar.addMenu(view_menu)
+        self.follow_action = QAction("Follow log file", self)
+        self.follow_action.setCheckable(True)
+        self.follow_action.setEnabled(False)  # solo con un único .log, cuando termina la carga
+        self.follow_action.toggled.connect(self.set_follow_log)
+        view_menu.addAction(self.follow_action)
+        stats_action = QAction("Playback statistics", self)
+        stats_action.triggered.connect(self.show_playback_stats)
+        view_menu.addAction(stats_action)
+
         help_menu = QMenu("Help", self)
         menubar.addMenu(help_menu) 
         about_action = QAction("About", self)
@@ -268,52 +3339,14 @@ class LogVideoPlayer(QMainWindow):
         help_menu.addAction(check_update_action)
                     
         self.log_table = QTableView()
-        self.log_model = QStandardItemModel(len(self.log_lines), 2)
-        self.log_model.setHorizontalHeaderLabels(["Timestamp", "Console output"])
-        
-        video_end_time = self.video_start_time + datetime.timedelta(seconds=self.total_frames / self.fps)
+        self.log_model = LogTableModel(self.logs, self.video_start_time, self.video_end_time(), self)
         
-        for row, (t, msg) in enumerate(self.logs):
-            ts_item = QStandardItem(t.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3])
-            ts_item.setEditable(False)
-            
-            clean_msg = re.sub(r"^\[\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}:\d+\]\s*", "", msg)
-
-            msg_item = QStandardItem(clean_msg)
-            msg_item.setEditable(False)
-            
-            if "unhandled exception" in clean_msg.lower() or "callstack" in clean_msg.lower() or "logwindows: error" in clean_msg.lower():
-                ts_item.setBackground(QColor("#2b0000"))  # fondo rojo muy oscuro
-                msg_item.setBackground(QColor("#2b0000"))
-                ts_item.setForeground(QColor("#ff9999"))  # texto rojo claro
-                msg_item.setForeground(QColor("#ff9999"))
-            elif "win requestexit" in clean_msg.lower():
-                ts_item.setBackground(QColor("#000316"))  # oscuro amarillento
-                msg_item.setBackground(QColor("#000316"))
-                ts_item.setForeground(QColor("#9FD8DC"))  # texto amarillo claro
-                msg_item.setForeground(QColor("#9FD8DC"))
-            elif "logmemory" in clean_msg.lower():
-                ts_item.setBackground(QColor("#000F16"))  # oscuro amarillento
-                msg_item.setBackground(QColor("#000F16"))
-                ts_item.setForeground(QColor("#9FDCD4"))  # texto amarillo claro
-                msg_item.setForeground(QColor("#9FDCD4"))
-            elif self.video_start_time <= t <= video_end_time:
-                ts_item.setBackground(QColor("#161600"))  # oscuro amarillento
-                msg_item.setBackground(QColor("#161600"))
-                ts_item.setForeground(QColor("#DCD69F"))  # texto amarillo claro
-                msg_item.setForeground(QColor("#DCD69F"))
-            
-            self.log_model.setItem(row, 0, ts_item)
-            self.log_model.setItem(row, 1, msg_item)
-        
-        self.log_table.setModel(self.log_model)
         self.log_table.verticalHeader().setVisible(False)
-        self.log_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
-        self.log_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.log_table.setFont(QFont('Segoe UI', 9))
+        self.set_log_table_model(self.log_model)
         self.log_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.log_table.setSelectionMode(QAbstractItemView.SingleSelection)
         self.log_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
-        self.log_table.setFont(QFont('Segoe UI', 9))
         self.log_table.setStyleSheet("""
             QTableView {
                 background-color: #000000;
@@ -332,36 +3365,63 @@ class LogVideoPlayer(QMainWindow):
         """)
         self.log_table.verticalScrollBar().valueChanged.connect(self.on_log_scroll)
         self.log_table.doubleClicked.connect(self.on_log_click)
+        self.log_table.clicked.connect(self.on_log_table_clicked)
+
+        # Búsqueda: índice de tokens en segundo plano o regex por chunks; los resultados filtran la tabla
+        self.search_index = MergedSearchIndex() if isinstance(self.logs, MergedLogRecords) else SearchIndex()
+        self.search_indexer = None
+        self.search_tail_pending = False  # el indexer en curso es por lo que agregó el modo follow
+        self.regex_searcher = None
+        self.regex_tail_start = None  # hasta que llegue el finished del regex_searcher: desde dónde falta buscar
+        self.log_filter = LogFilterModel(self)
+        self.log_filter.setSourceModel(self.log_model)
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search logs (Ctrl+F, Enter: next match)")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_regex = QCheckBox("Regex")
+        self.search_label = QLabel("")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.search_edit.returnPressed.connect(self.on_search_return)
+        self.search_regex.toggled.connect(self.run_search)
+        QShortcut(QKeySequence.Find, self, activated=self.focus_search)
+        search_layout = QHBoxLayout()
+        search_layout.addWidget(self.search_edit, stretch=1)
+        search_layout.addWidget(self.search_regex)
+        search_layout.addWidget(self.search_label)
 
         self.info_label = QLabel("")
         self.info_label.setAlignment(Qt.AlignCenter)
         self.info_label.setFont(QFont("Consolas", 14, QFont.Bold))
 
         left_layout = QVBoxLayout()
+        left_layout.addLayout(search_layout)
         left_layout.addWidget(self.log_table, stretch=8)
         left_layout.addWidget(self.info_label, stretch=1)
         left_widget = QWidget()
         left_widget.setLayout(left_layout)
 
-        self.video_label = QLabel()
-        self.video_label.setAlignment(Qt.AlignCenter)
-        self.video_label.setStyleSheet("background-color: black;")
-        self.video_label.setMinimumWidth(220)
-        right_layout = QVBoxLayout()
-        right_layout.addWidget(self.video_label)
+        self.video_grid = QGridLayout()
+        self.layout_video_panes()
         right_widget = QWidget()
-        right_widget.setLayout(right_layout)
+        right_widget.setLayout(self.video_grid)
 
         splitter = QSplitter(Qt.Horizontal)
         splitter.addWidget(left_widget)
         splitter.addWidget(right_widget)
         splitter.setSizes([self.width() // 2, self.width() // 2])
 
-        self.slider = QSlider(Qt.Horizontal)
+        self.slider = PreviewSlider(Qt.Horizontal)
         self.slider.setRange(0, max(0, self.total_frames - 1))
         self.slider.sliderPressed.connect(self.slider_start_drag)
         self.slider.sliderReleased.connect(self.slider_end_drag)
         self.slider.sliderMoved.connect(self.slider_drag_move)
+        self.slider.hovered.connect(self.show_thumbnail)
+        self.slider.left.connect(self.hide_thumbnail)
+        self.thumbnail_popup = QLabel(self, Qt.ToolTip)
 
         self.btn_start = QPushButton("")
         self.btn_start.setIcon(QIcon(RESTART_ICON_PATH))
@@ -433,12 +3493,252 @@ class LogVideoPlayer(QMainWindow):
         central_widget.setLayout(layout)
         self.setCentralWidget(central_widget)
 
+        # El timer solo despierta a la GUI; qué frame mostrar lo decide self.clock
         self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
         self.timer.timeout.connect(self.update_frame)
+        self.underrun_label = QLabel("")
+        self.underrun_label.setToolTip("Underruns: times playback was ready for a frame before the decoder had one.\n"
+                                       "Dropped frames: frames skipped to keep the video in step with real time.")
+        self.statusBar().addPermanentWidget(self.underrun_label)
+        self.shown_underruns = None
 
+        # Modo follow: se consulta el tamaño del log y se parsea solo lo nuevo
+        self.follow_timer = QTimer(self)
+        self.follow_timer.setInterval(500)
+        self.follow_timer.timeout.connect(self.poll_followed_log)
+
+        for pane in self.panes:
+            pane.indexed.connect(lambda keyframes, pane=pane: self.on_video_indexed(pane, keyframes))
+            pane.start()
         self.set_speed(1.0)
         self.render_current_frame(1)
 
+        if isinstance(log_path_or_logs, (LogRecords, MergedLogRecords)):
+            self.start_search_indexer()
+        else:
+            self.start_log_loader()
+
+    def set_log_table_model(self, model):
+        self.log_table.setModel(model)
+        # Filas de alto fijo y columna de timestamp de ancho fijo: la vista no recorre el modelo entero
+        metrics = QFontMetrics(self.log_table.font())
+        self.log_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.log_table.verticalHeader().setDefaultSectionSize(metrics.height() + 6)
+        self.log_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Fixed)
+        icon_width = self.log_table.style().pixelMetric(QStyle.PM_SmallIconSize) + 4  # ícono de expandir
+        self.log_table.horizontalHeader().resizeSection(0, metrics.horizontalAdvance("0000-00-00 00:00:00.000") + icon_width + 16)
+        if isinstance(self.logs, MergedLogRecords):
+            self.log_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Interactive)
+            self.log_table.horizontalHeader().resizeSection(
+                1, min(240, max(metrics.horizontalAdvance(name) for name in self.logs.names) + 16))
+        self.log_table.horizontalHeader().setSectionResizeMode(model.columnCount() - 1, QHeaderView.Stretch)
+
+    def start_log_loader(self):
+        self.load_label = QLabel("Loading logs...")
+        self.load_progress = QProgressBar()
+        self.load_progress.setRange(0, 100)
+        self.load_progress.setMaximumWidth(240)
+        self.statusBar().addWidget(self.load_label)
+        self.statusBar().addWidget(self.load_progress)
+
+        self.log_loader = LogLoader(self.logs, self)
+        self.log_loader.chunk_ready.connect(self.log_model.append_chunk)
+        self.log_loader.index_ready.connect(self.log_model.adopt_index)
+        self.log_loader.progress.connect(self.load_progress.setValue)
+        self.log_loader.finished.connect(self.on_logs_loaded)
+        self.log_loader.start()
+
+    def on_logs_loaded(self):
+        self.statusBar().removeWidget(self.load_label)
+        self.statusBar().removeWidget(self.load_progress)
+        self.statusBar().showMessage(f"{len(self.logs):,} log lines loaded", 5000)
+        self.follow_action.setEnabled(isinstance(self.logs, LogRecords))  # el modo follow sigue un solo archivo
+        self.start_search_indexer()
+        # Resaltar la línea del frame actual ahora que están todas las filas
+        self.last_highlight_index = -1
+        self.update_log_highlight(self.timeline.time_of(self.slider.value()))
+
+    def set_follow_log(self, enabled):
+        if enabled:
+            self.follow_timer.start()
+            self.statusBar().showMessage("Following log file")
+        else:
+            self.follow_timer.stop()
+            self.statusBar().clearMessage()
+
+    def poll_followed_log(self):
+        if self.log_loader and self.log_loader.isRunning():
+            return
+        if self.export_worker and self.export_worker.isRunning():
+            return  # el export está copiando el archivo mapeado
+        if self.search_indexer and self.search_indexer.isRunning():
+            return  # el índice lee las columnas del log mientras se construye
+        if self.regex_searcher and self.regex_searcher.isRunning():
+            return  # igual que la búsqueda con regex
+        rows = len(self.logs)
+        tail_start = int(self.logs.source.offsets[-2]) if len(self.logs.source) else 0
+        status = self.log_model.follow_source()
+        if status == "rotated":
+            self.reload_logs()
+        elif status == "grown" and len(self.logs) != rows:
+            self.statusBar().showMessage(f"Following log file: {len(self.logs):,} lines")
+            self.search_followed_tail(tail_start)
+
+    def reload_logs(self):
+        # El archivo se rotó o truncó: se vuelve a abrir desde cero
+        old_source = self.logs.source
+        self.logs = LogRecords(LogSource(self.log_path), self.logs.classifier)
+        self.stop_search_workers()
+        self.search_index = SearchIndex()
+        self.log_model.set_logs(self.logs)
+        self.last_highlight_index = -1
+        old_source.close()
+        self.start_log_loader()
+
+    def closeEvent(self, event):
+        self.follow_timer.stop()
+        self.timer.stop()
+        for pane in self.panes:
+            pane.stop()
+        if self.thumbnail_builder:
+            self.thumbnail_builder.requestInterruption()
+            self.thumbnail_builder.wait()
+        if self.log_loader and self.log_loader.isRunning():
+            self.log_loader.requestInterruption()
+            self.log_loader.wait()
+        if self.export_worker and self.export_worker.isRunning():
+            self.export_worker.requestInterruption()  # mata ffmpeg y borra lo escrito
+            self.export_worker.wait()
+        self.stop_search_workers()
+        super().closeEvent(event)
+
+    # --- Búsqueda ---
+    def start_search_indexer(self):
+        self.search_indexer = SearchIndexer(self.search_index, self.logs, self)
+        self.search_indexer.finished.connect(self.on_search_index_ready)
+        self.search_indexer.start()
+
+    def on_search_index_ready(self):
+        tail, self.search_tail_pending = self.search_tail_pending, False
+        if not self.search_edit.text().strip() or self.search_regex.isChecked():
+            return
+        if tail and self.log_table.model() is self.log_filter:
+            # Los resultados ya mostrados no cambian: solo se agregan los de las líneas nuevas
+            self.log_filter.add_records(self.search_index.query(self.search_edit.text(), self.logs))
+            self.update_search_label()
+        else:
+            self.run_search()
+
+    def stop_search_workers(self):
+        for worker in (self.search_indexer, self.regex_searcher):
+            if worker and worker.isRunning():
+                worker.requestInterruption()
+                worker.wait()
+
+    def focus_search(self):
+        self.search_edit.setFocus()
+        self.search_edit.selectAll()
+
+    def run_search(self):
+        self.search_timer.stop()
+        if self.regex_searcher and self.regex_searcher.isRunning():
+            self.regex_searcher.requestInterruption()
+            self.regex_searcher.wait()
+        text = self.search_edit.text()
+        if not text.strip():
+            self.show_search_results(None)
+            return
+        if self.search_regex.isChecked():
+            try:
+                pattern = re.compile(text.encode("utf-8"), re.IGNORECASE | re.MULTILINE)
+            except re.error:
+                self.search_label.setText("Invalid regex")
+                return
+            self.show_search_results(np.empty(0, dtype=np.int64))
+            self.regex_searcher = RegexSearcher(self.logs, pattern, self)
+            self.regex_searcher.found.connect(self.on_regex_found)
+            self.regex_searcher.progress.connect(
+                lambda percent: self.search_label.setText(f"{len(self.log_filter.records):,} matches ({percent}%)"))
+            self.regex_searcher.finished.connect(self.on_regex_finished)
+            self.regex_tail_start = self.regex_searcher.end
+            self.regex_searcher.start()
+            return
+        if (self.log_loader and self.log_loader.isRunning()) or self.search_indexer is None or self.search_indexer.isRunning():
+            self.search_label.setText("Indexing...")  # se repite en on_search_index_ready
+            self.search_tail_pending = False
+            return
+        if self.search_index.behind(self.logs):
+            self.search_label.setText("Indexing...")
+            self.start_search_indexer()  # lo que agregó el modo follow, en segundo plano
+            return
+        self.show_search_results(self.search_index.query(text, self.logs))
+
+    def on_regex_found(self, records):
+        # Pueden llegar resultados encolados de una búsqueda ya cancelada
+        if self.sender() is self.regex_searcher and self.log_table.model() is self.log_filter:
+            self.log_filter.add_records(records)
+
+    def on_regex_finished(self):
+        if self.sender() is self.regex_searcher:
+            # Lo que agregó el modo follow desde que empezó la búsqueda (llega después de todos los found)
+            start, self.regex_tail_start = self.regex_tail_start, None
+            if start is not None and self.regex_searcher.logs is self.logs and self.log_table.model() is self.log_filter:
+                self.log_filter.add_records(regex_search_rows(
+                    self.logs, self.regex_searcher.pattern, start, int(self.logs.source.offsets[-1])))
+        self.update_search_label()
+
+    def search_followed_tail(self, start):
+        # Solo se busca en lo nuevo; los registros ya filtrados no cambian
+        if self.log_table.model() is not self.log_filter:
+            return
+        if self.search_regex.isChecked():
+            if self.regex_tail_start is not None:
+                # La búsqueda completa todavía no entregó todo: on_regex_finished busca lo nuevo
+                self.regex_tail_start = min(self.regex_tail_start, start)
+            elif self.regex_searcher:
+                self.log_filter.add_records(regex_search_rows(
+                    self.logs, self.regex_searcher.pattern, start, int(self.logs.source.offsets[-1])))
+        elif not (self.search_indexer and self.search_indexer.isRunning()):
+            # Indexar lo nuevo en segundo plano; on_search_index_ready agrega sus resultados
+            self.search_tail_pending = True
+            self.start_search_indexer()
+        self.update_search_label()
+
+    def show_search_results(self, records):
+        """records None vuelve a la tabla completa; si no, la tabla muestra solo esos registros."""
+        if records is None:
+            self.search_label.setText("")
+            if self.log_table.model() is not self.log_model:
+                self.set_log_table_model(self.log_model)
+        else:
+            self.log_filter.set_records(records)
+            if self.log_table.model() is not self.log_filter:
+                self.set_log_table_model(self.log_filter)
+            self.update_search_label()
+        self.last_highlight_index = -1
+        if len(self.logs):
+            self.update_log_highlight(self.timeline.time_of(self.slider.value()))
+
+    def update_search_label(self):
+        if self.log_table.model() is self.log_filter:
+            self.search_label.setText(f"{len(self.log_filter.records):,} matches")
+
+    def on_search_return(self):
+        self.jump_to_match(-1 if QApplication.keyboardModifiers() & Qt.ShiftModifier else 1)
+
+    def jump_to_match(self, step):
+        """Salta al resultado siguiente (step 1) o anterior (-1) al registro resaltado y mueve el video."""
+        records = self.log_filter.records
+        if self.log_table.model() is not self.log_filter or not len(records):
+            return
+        if step > 0:
+            row = int(np.searchsorted(records, self.last_highlight_index, side="right")) % len(records)
+        else:
+            row = (int(np.searchsorted(records, self.last_highlight_index, side="left")) - 1) % len(records)
+        self.highlight_log_line(int(records[row]))
+        self.on_log_click(self.log_filter.index(row, 1))
+
     # --- Sincronización desde logs ---
     def show_about_dialog(self):
         dialog = QDialog(self)
@@ -514,57 +3814,106 @@ class LogVideoPlayer(QMainWindow):
 
         dialog.exec()
     
+    @property
+    def primary(self):
+        return self.panes[0]
+
+    @property
+    def timeline(self):
+        return self.primary.timeline
+
+    @property
+    def total_frames(self):
+        return self.primary.total_frames
+
+    @staticmethod
+    def frame_cache_bytes(panes):
+        # frame_cache_mb es para todos los videos juntos
+        return int(SETTINGS.get("frame_cache_mb") or 0) * 1024 * 1024 // panes
+
+    def layout_video_panes(self):
+        # Uno debajo del otro hasta tres; más, en dos columnas
+        columns = 1 if len(self.panes) <= 3 else 2
+        for pane in self.panes:
+            self.video_grid.removeWidget(pane.view)
+        for i, pane in enumerate(self.panes):
+            self.video_grid.addWidget(pane.view, *divmod(i, columns))
+
+    def select_extra_video(self):
+        start_dir = os.path.dirname(self.primary.video_path)
+        path, _ = QFileDialog.getOpenFileName(self, "Add Video File", start_dir, "Video Files (*.mp4 *.mkv *.mpg *.mov)")
+        if path:
+            self.add_video(path, get_file_creation_time_utc(path))
+
+    def add_video(self, video_path, video_start_time):
+        """Agrega otro video (otra cámara) sincronizado con el primero por su hora de inicio."""
+        offset = (video_start_time - self.video_start_time).total_seconds()
+        pane = VideoPane(video_path, self.clock, offset, parent=self)
+        self.panes.append(pane)
+        for other in self.panes:
+            other.frame_cache.set_max_bytes(self.frame_cache_bytes(len(self.panes)))
+        pane.indexed.connect(lambda keyframes: self.on_video_indexed(pane, keyframes))
+        self.layout_video_panes()
+        pane.start()
+        if self.playing:
+            pane.play(pane.frame_at(self.clock.seconds()))
+        elif not pane.request(pane.frame_at(self.primary.clock_seconds(max(0, self.position - 1)))):
+            pane.clear()
+
+    def start_playback_at(self, seconds):
+        self.clock.start(seconds)
+        for pane in self.panes:
+            pane.play(pane.frame_at(seconds))
+
     def render_current_frame(self, frame_number: int):
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-        ret, img = self.cap.read()
-        if not ret:
+        """Pide frame_number del primer video, y el del mismo momento de los otros, a sus SeekWorker
+        sin esperarlos: decodifican a la vez. False si está fuera del primer video."""
+        if not self.primary.request(frame_number):
             return False
-
-        label_w = self.video_label.width()
-        label_h = self.video_label.height()
-        frame_h, frame_w = img.shape[:2]
-        scale = min(label_w / frame_w, label_h / frame_h)
-        new_w = max(1, int(frame_w * scale))
-        new_h = max(1, int(frame_h * scale))
-
-        resized_frame = cv2.copyMakeBorder(
-            cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA),
-            top=(label_h - new_h) // 2,
-            bottom=(label_h - new_h + 1) // 2,
-            left=(label_w - new_w) // 2,
-            right=(label_w - new_w + 1) // 2,
-            borderType=cv2.BORDER_CONSTANT,
-            value=(0, 0, 0)
-        )
-        rgb_image = cv2.cvtColor(resized_frame, cv2.COLOR_BGR2RGB)
-        qt_image = QImage(rgb_image.data, rgb_image.shape[1], rgb_image.shape[0],
-                        rgb_image.strides[0], QImage.Format_RGB888)
-        self.video_label.setPixmap(QPixmap.fromImage(qt_image))
+        self.position = frame_number + 1
+        self.defer_thumbnails()
+        seconds = self.primary.clock_seconds(frame_number)
+        for pane in self.panes[1:]:
+            if not pane.request(pane.frame_at(seconds)):
+                pane.clear()
+        if self.playing:
+            self.start_playback_at(self.primary.clock_seconds(frame_number + 1))
         return True
 
+    def set_position(self, frame_number):
+        """Mueve la posición de lectura sin mostrar nada; si se está reproduciendo, sigue desde ahí."""
+        self.position = frame_number
+        if self.playing:
+            self.start_playback_at(self.primary.clock_seconds(frame_number))
+
     def on_log_scroll(self):
         if self.syncing_from_logs:
             return
         first_row = self.log_table.rowAt(0)
-        if 0 <= first_row < len(self.log_times):
-            target_time = self.log_times[first_row]
+        model = self.log_table.model()
+        if 0 <= first_row < model.rowCount():
+            target_time = self.logs.timestamp(model.record_for_row(first_row))
             video_seconds = (target_time - self.video_start_time).total_seconds()
             if video_seconds < 0:
                 return
-            frame = int(video_seconds * self.fps)
+            frame = self.timeline.frame_at(video_seconds)
             if self.render_current_frame(frame):
                 self.slider.setValue(frame)
                 self.update_info_label(video_seconds, frame)
 
+    def on_log_table_clicked(self, index):
+        # Click en el timestamp: expande/colapsa las líneas de continuación
+        if index.column() == 0:
+            self.log_table.model().toggle_expanded(index.row())
+
     def on_log_click(self, index):
-        row = index.row()
-        if 0 <= row < len(self.log_times):
-            target_time = self.log_times[row]
+        row = self.log_table.model().record_for_row(index.row())
+        if 0 <= row < len(self.logs):
+            target_time = self.logs.timestamp(row)
             video_seconds = (target_time - self.video_start_time).total_seconds()
             if video_seconds < 0:
                 return
-            frame = int(video_seconds * self.fps)
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, frame)
+            frame = self.timeline.frame_at(video_seconds)
             if self.render_current_frame(frame):
                 self.slider.setValue(frame)
                 self.update_info_label(video_seconds, frame)
@@ -575,18 +3924,27 @@ class LogVideoPlayer(QMainWindow):
             self.toggle_play()
 
     def update_timer_interval(self):
-        interval = int(1000 / (self.fps * self.playback_speed))
+        # Dos veces por frame: un frame llega a pantalla con medio período de atraso como mucho
+        peak_fps = max(pane.timeline.peak_fps for pane in self.panes)
+        interval = max(1, int(1000 / (peak_fps * self.playback_speed) / 2))
         self.timer.setInterval(interval)
+        self.clock.set_speed(self.playback_speed)
 
     def toggle_play(self):
         if not self.playing:
             # Si está parado y en el último frame, volver al inicio
             if self.get_current_frame() >= self.total_frames - 1:
-                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                self.set_position(0)
                 self.slider.setValue(0)
                 self.update_log_highlight(0)
         self.playing = not self.playing
         self.btn_play.setIcon(QIcon(PLAY_ICON_PATH if not self.playing else PAUSE_ICON_PATH))
+        if self.playing:
+            self.start_playback_at(self.primary.clock_seconds(self.get_current_frame()))
+        else:
+            self.clock.stop()
+            for pane in self.panes:
+                pane.pause()
         if self.playing and not self.timer.isActive():
             self.timer.start()
 
@@ -603,67 +3961,104 @@ class LogVideoPlayer(QMainWindow):
             self.speed_buttons[2].setStyleSheet("background-color: #007BFF; color: white;")
 
     def seek_relative(self, seconds):
-        frame_shift = int(seconds * self.fps)
-        new_frame = max(0, min(self.total_frames - 1, self.get_current_frame() + frame_shift))
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, new_frame)
+        target = self.timeline.time_of(self.get_current_frame()) + seconds
+        new_frame = max(0, min(self.total_frames - 1, self.timeline.frame_at(target)))
+        self.set_position(new_frame)
         self.slider.setValue(new_frame)
-        self.update_log_highlight(new_frame / self.fps)
+        self.update_log_highlight(self.timeline.time_of(new_frame))
 
     def go_to_start(self):
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
         self.slider.setValue(0)
         self.update_log_highlight(0)
         self.render_current_frame(0)
         self.update_info_label(0, 0)
 
     def go_to_end(self):
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.total_frames - 1)
         self.slider.setValue(self.total_frames - 1)
-        self.update_log_highlight(self.total_frames / self.fps)
+        self.update_log_highlight(self.timeline.duration())
         self.render_current_frame(self.total_frames - 1)
-        self.update_info_label(self.total_frames/self.fps, self.total_frames - 1)
+        self.update_info_label(self.timeline.duration(), self.total_frames - 1)
 
     def slider_start_drag(self):
         self.slider_dragging = True
 
     def slider_end_drag(self):
         self.slider_dragging = False
-        self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.slider.value())
-        self.update_log_highlight(self.slider.value() / self.fps)
+        self.hide_thumbnail()
+        self.update_log_highlight(self.timeline.time_of(self.slider.value()))
         if self.render_current_frame(self.slider.value()):
-            self.update_log_highlight(self.slider.value() / self.fps)
+            self.update_log_highlight(self.timeline.time_of(self.slider.value()))
 
     def slider_drag_move(self, frame):
-        self.update_log_highlight(frame / self.fps)
+        self.update_log_highlight(self.timeline.time_of(frame))
+        self.show_thumbnail(frame, self.slider.x_for_value(frame))
+
+    def show_thumbnail(self, frame, x):
+        """Muestra sobre el slider, a la altura x, la miniatura más cercana a frame (sin decodificar)."""
+        rgb_image = self.thumbnails.tile(self.timeline.time_of(frame))
+        if rgb_image is None:
+            self.thumbnail_popup.hide()
+            return
+        self.thumbnail_popup.setPixmap(QPixmap.fromImage(rgb_to_qimage(rgb_image).copy()))
+        self.thumbnail_popup.adjustSize()
+        top_left = self.slider.mapToGlobal(QPoint(x - self.thumbnail_popup.width() // 2,
+                                                  -self.thumbnail_popup.height() - 4))
+        self.thumbnail_popup.move(top_left)
+        self.thumbnail_popup.show()
+
+    def hide_thumbnail(self):
+        self.thumbnail_popup.hide()
+
+    def start_thumbnail_builder(self, keyframes):
+        if self.thumbnails.complete() or self.thumbnail_builder:
+            return
+        self.thumbnail_builder = ThumbnailBuilder(self.video_path, self.thumbnails, self.timeline, keyframes,
+                                                  lambda: any(pane.seek_worker.busy for pane in self.panes), self)
+        self.thumbnail_builder.finished.connect(self.on_thumbnails_built)
+        self.thumbnail_builder.start(QThread.LowPriority)
+
+    def defer_thumbnails(self):
+        if self.thumbnail_builder:
+            self.thumbnail_builder.defer()
+
+    def on_thumbnails_built(self):
+        if self.thumbnails.complete():
+            VIDEO_CACHE.store_thumbnails(self.video_path, self.thumbnails)
 
     def get_current_frame(self):
-        return int(self.cap.get(cv2.CAP_PROP_POS_FRAMES))
+        return self.position
 
     def highlight_log_line(self, index: int):
-        if index == self.last_highlight_index or index < 0 or index >= len(self.log_lines):
+        if index == self.last_highlight_index or index < 0 or index >= len(self.logs):
             return
         self.last_highlight_index = index
 
         self.syncing_from_logs = True
         self.log_table.clearSelection()
-        self.log_table.selectRow(index)
-        self.log_table.scrollTo(self.log_model.index(index, 0), QTableView.PositionAtCenter)
+        model = self.log_table.model()
+        row = model.row_for_record(index)
+        if row >= 0:
+            self.log_table.selectRow(row)
+            self.log_table.scrollTo(model.index(row, 0), QTableView.PositionAtCenter)
         self.syncing_from_logs = False
 
     def update_info_label(self, video_seconds: float, frame_number: int):
         current_utc = self.video_start_time + datetime.timedelta(seconds=video_seconds)
-        deltaInaccuracy = (1 / self.fps) * 1000
+        deltaInaccuracy = self.timeline.frame_duration(frame_number) * 1000
         ts = current_utc.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
         self.info_label.setText(
             f"UTC: {ts} ±{deltaInaccuracy:.2f}ms   Frame: {frame_number}"
         )
 
     def update_log_highlight(self, video_seconds):
+        if not len(self.logs):
+            return
         current_video_time = self.video_start_time + datetime.timedelta(seconds=video_seconds)
-        idx = bisect.bisect_right(self.log_times, current_video_time)-1
+        current_ms = datetime_to_ms(current_video_time)
+        idx = self.logs.row_at_time(current_ms)
         self.prevIdx = idx
         
-        if idx >= len(self.log_times) or current_video_time >= self.log_times[-1]:
+        if idx >= len(self.logs) or current_ms >= self.logs.times[-1]:
             self.highlight_log_line(idx)
         elif idx > 0:
             self.highlight_log_line(idx)
@@ -671,70 +4066,133 @@ class LogVideoPlayer(QMainWindow):
     def update_frame(self):
         if self.slider_dragging:
             return
-        if self.playing:
-            ret, frame = self.cap.read()
-        else:
+        if not self.playing:
             return
-        if not ret:
+        self.defer_thumbnails()
+        frame_number = None
+        for pane in self.panes:
+            shown = pane.update()
+            if pane is self.primary:
+                frame_number = shown
+            elif shown == VideoPane.ENDED:
+                pane.clear()  # terminó antes que el primero: en blanco, como fuera de su tramo al buscar
+        self.update_underrun_label()
+        if frame_number is None:
+            return  # todavía no toca el próximo, o el decodificador va atrasado: queda el actual
+        if frame_number == VideoPane.ENDED:
             # Video terminado
             self.playing = False
+            self.clock.stop()
             self.btn_play.setIcon(QIcon(PLAY_ICON_PATH))
-            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.total_frames - 1)
+            for pane in self.panes:
+                pane.pause()
+            self.set_position(self.total_frames - 1)
             self.slider.setValue(self.total_frames - 1)
             self.timer.stop()
             return
-        # Letterbox
-        label_w = self.video_label.width()
-        label_h = self.video_label.height()
-        frame_h, frame_w = frame.shape[:2]
-        scale = min(label_w / frame_w, label_h / frame_h)
-        new_w = max(1, int(frame_w * scale))
-        new_h = max(1, int(frame_h * scale))
-        resized_frame = cv2.copyMakeBorder(
-            cv2.resize(frame, (new_w, new_h), interpolation=cv2.INTER_AREA),
-            top=(label_h - new_h) // 2,
-            bottom=(label_h - new_h + 1) // 2,
-            left=(label_w - new_w) // 2,
-            right=(label_w - new_w + 1) // 2,
-            borderType=cv2.BORDER_CONSTANT,
-            value=(0, 0, 0)
-        )
-        rgb_image = cv2.cvtColor(resized_frame, cv2.COLOR_BGR2RGB)
-        qt_image = QImage(rgb_image.data, rgb_image.shape[1], rgb_image.shape[0],
-                          rgb_image.strides[0], QImage.Format_RGB888)
-        self.video_label.setPixmap(QPixmap.fromImage(qt_image))
+        self.position = frame_number + 1
         current_frame = self.get_current_frame()
         self.slider.setValue(current_frame)
-        self.update_log_highlight(current_frame / self.fps)
-        current_video_time = self.video_start_time + datetime.timedelta(seconds=current_frame / self.fps)
-        deltaInaccuracy = (1/self.fps)*1000
+        self.update_log_highlight(self.timeline.time_of(current_frame))
+        current_video_time = self.video_start_time + datetime.timedelta(seconds=self.timeline.time_of(current_frame))
+        deltaInaccuracy = self.timeline.frame_duration(current_frame)*1000
         self.info_label.setText(
             f"UTC: {current_video_time.strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]} ±{deltaInaccuracy:.2f}ms   Frame: {current_frame}"
         )
 
+    def on_video_indexed(self, pane, keyframes):
+        self.update_timer_interval()
+        if pane is not self.primary:
+            return
+        self.slider.setRange(0, max(0, self.total_frames - 1))
+        self.log_model.set_video_range(self.video_start_time, self.video_end_time())
+        self.log_table.viewport().update()
+        self.start_thumbnail_builder(keyframes)
+
+    def video_end_time(self):
+        return self.video_start_time + datetime.timedelta(seconds=self.timeline.duration())
+
+    def show_playback_stats(self):
+        if len(self.panes) == 1:
+            text = self.primary.summary()
+        else:
+            text = "\n\n".join(f"{os.path.basename(pane.video_path)}\n{pane.summary()}" for pane in self.panes)
+        QMessageBox.information(self, "Playback statistics", text)
+
+    def update_underrun_label(self):
+        counts = (sum(pane.frame_ring.underruns for pane in self.panes),
+                  sum(pane.clock.dropped + pane.clock.skipped for pane in self.panes))
+        if counts != self.shown_underruns:
+            self.shown_underruns = counts
+            self.underrun_label.setText(f"Decode underruns: {counts[0]}   Dropped frames: {counts[1]}")
+
     def export_current_analysis(self):
+        if self.export_worker and self.export_worker.isRunning():
+            # Uno por vez: se muestra el que está en curso antes de pedir otro destino
+            self.export_dialog.show()
+            self.export_dialog.raise_()
+            self.export_dialog.activateWindow()
+            return
         out_path, _ = QFileDialog.getSaveFileName(self, "Export synced logs", "", "Lupi Analysis (*.lupi)")
         if not out_path:
             return
         if not out_path.lower().endswith(".lupi"):
             out_path += ".lupi"
 
-        progress_dialog = ExportProgressDialog(self)
-        progress_dialog.show()
+        window = self.export_trim_window()
+        if window is not None:
+            margin = float(SETTINGS.get("export_margin_seconds") or 0)
+            answer = QMessageBox.question(
+                self, "Export synced logs",
+                f"The logs only cover part of this {format_eta(self.timeline.duration())} video.\n"
+                f"Export just {format_eta(window[0])} to {format_eta(window[1])} "
+                f"(the logs plus {margin:g} s on each side)?",
+                QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel)
+            if answer == QMessageBox.Cancel:
+                return
+            if answer != QMessageBox.Yes:
+                window = None
+        # El reencode corre en otro hilo; la ventana sigue respondiendo mientras tanto
+        self.export_worker = ExportWorker(self, out_path, window, self)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_dialog = ExportProgressDialog(self.export_worker, self)
+        self.export_dialog.show()
+        self.export_worker.start()
 
-        export_analysis(self, out_path, progress_dialog)
+    def export_trim_window(self):
+        """(inicio, fin) en segundos del video que cubren los logs más el margen, si recortar ahorra
+        una parte que valga la pena; None si no."""
+        if not len(self.logs) or (self.log_loader and self.log_loader.isRunning()):
+            return None
+        margin = float(SETTINGS.get("export_margin_seconds") or 0)
+        video_start_ms = datetime_to_ms(self.video_start_time)
+        duration = self.timeline.duration()
+        start = max(0.0, (int(self.logs.times[0]) - video_start_ms) / 1000 - margin)
+        end = min(duration, (int(self.logs.times[-1]) - video_start_ms) / 1000 + margin)
+        if end <= start or end - start > (1 - EXPORT_TRIM_MIN_SAVING) * duration:
+            return None
+        return start, end
 
-        progress_dialog.close()
-        QMessageBox.information(self, "Export complete!", f"File saved as:\n{out_path}")
+    def on_export_finished(self):
+        worker = self.export_worker
+        if worker.cancelled:
+            self.statusBar().showMessage("Export cancelled", 5000)
+        elif worker.error:
+            QMessageBox.warning(self, "Export failed", f"Could not export the analysis:\n{worker.error}")
+        else:
+            QMessageBox.information(self, "Export complete!", f"File saved as:\n{worker.out_path}")
 
     def open_lupi_analysis(self):
         path, _ = QFileDialog.getOpenFileName(self, "Select synced logs file", "", "Lupi Analysis (*.lupi)")
         if path:
             title = str(os.path.basename(path))
-            video_path, logs, original_logs, video_start_time, fps = import_analysis(path)
+            analysis = import_analysis_or_warn(path, self)
+            if analysis is None:
+                return
+            video_path, logs, video_start_time, fps = analysis
             self.hide()
-            self.player = LogVideoPlayer(video_path, logs, original_logs, video_start_time, fps, title)
-        self.player.showMaximized()
+            self.player = LogVideoPlayer(video_path, logs, video_start_time, fps, title)
+            self.player.showMaximized()
 
 # ------------------- PANTALLA INICIAL -------------------
 
@@ -745,9 +4203,9 @@ class FileSelector(QWidget):
         self.setFixedSize(500, 300)
         self.setWindowIcon(QIcon(APPICON))
         self.selected_video = None
-        self.selected_log = None
+        self.selected_logs = []  # (ruta, offset de reloj en ms)
         self.video_times = None
-        self.logs = None
+        self.log_time_range = None
         self.flaggy = testing_mode
                
         videoicon = QIcon(VIDEO_ICON_PATH)
@@ -763,7 +4221,7 @@ class FileSelector(QWidget):
         self.status_label.setStyleSheet("color: red; font-size: 16px")
         self.status_label.setAlignment(Qt.AlignCenter)
 
-        btn_log = QPushButton("Open Log File")
+        btn_log = QPushButton("Open Log File(s)")
         btn_log.setIcon(logsicon)
         btn_log.setFixedHeight(40)
         btn_log.setIconSize(QSize(36,36))
@@ -827,15 +4285,29 @@ class FileSelector(QWidget):
 
     def select_log(self):
         if self.flaggy:
-            path = LOG_PATH
+            paths = [LOG_PATH]
         else:
-            path, _ = QFileDialog.getOpenFileName(self, "Select Log File", "C:/", "Logging file (*.log)")
-        if path:
-            self.selected_log = path
-            self.logs, self.original_lines = parse_logs(path)
-            self.log_label.setWordWrap(True)
-            self.log_label.setText(os.path.basename(path))
-            self.check_compatibility()
+            paths, _ = QFileDialog.getOpenFileNames(self, "Select Log File(s)", "C:/", "Logging file (*.log)")
+        if not paths:
+            return
+        # Varios logs (cliente, servidor...) se combinan; cada uno puede tener el reloj corrido
+        selected = []
+        for path in paths:
+            offset = 0.0
+            if len(paths) > 1:
+                offset, ok = QInputDialog.getDouble(
+                    self, "Clock offset", f"Seconds to add to the timestamps of {os.path.basename(path)}:",
+                    0.0, -86400.0, 86400.0, 3)
+                if not ok:
+                    return
+            selected.append((path, round(offset * 1000)))
+        ranges = [(first + offset, last + offset) for (path, offset) in selected
+                  for first, last in [log_time_range(path) or (None, None)] if first is not None]
+        self.selected_logs = selected
+        self.log_time_range = (min(r[0] for r in ranges), max(r[1] for r in ranges)) if ranges else None
+        self.log_label.setWordWrap(True)
+        self.log_label.setText("\n".join(os.path.basename(path) for path, _ in selected))
+        self.check_compatibility()
 
     def select_video(self):
         if self.flaggy:
@@ -850,9 +4322,9 @@ class FileSelector(QWidget):
             self.check_compatibility()
 
     def check_compatibility(self):
-        if self.selected_video and self.selected_log:
-            log_times = [t for t, _ in self.logs]
-            if log_times and min(log_times) <= self.video_start_time <= max(log_times):
+        if self.selected_video and self.selected_logs:
+            # Primer y último timestamp: el log completo se parsea en el reproductor
+            if self.log_time_range and ms_to_datetime(self.log_time_range[0]) <= self.video_start_time <= ms_to_datetime(self.log_time_range[1]):
                 self.status_label.setStyleSheet("color: green; font-size: 16px")
                 self.status_label.setText("Files are synchronous")
                 self.start_btn.setEnabled(True)
@@ -864,7 +4336,10 @@ class FileSelector(QWidget):
 
     def start_player(self):
         self.close()
-        self.player = LogVideoPlayer(self.selected_video, self.selected_log, title="")
+        logs = self.selected_logs
+        if len(logs) == 1 and not logs[0][1]:
+            logs = logs[0][0]
+        self.player = LogVideoPlayer(self.selected_video, logs, title="")
         self.player.showMaximized()
 
     def open_lupi_from_selector(self, fileFlag=False, open_from=None):
@@ -872,25 +4347,57 @@ class FileSelector(QWidget):
             path, _ = QFileDialog.getOpenFileName(self, "Select synced logs file", "", "Lupi Analysis (*.lupi)")
             title = str(os.path.basename(path))
             if path:
-                video_path, logs, original_logs, video_start_time, fps = import_analysis(path)
+                analysis = import_analysis_or_warn(path, self)
+                if analysis is None:
+                    return
+                video_path, logs, video_start_time, fps = analysis
                 self.close()
-                player = LogVideoPlayer(video_path, logs, original_logs, video_start_time, fps, title)
+                player = LogVideoPlayer(video_path, logs, video_start_time, fps, title)
                 player.showMaximized()
         else:
             path = open_from
             title = str(os.path.basename(path))
             if path:
-                video_path, logs, original_logs, video_start_time, fps = import_analysis(path)
-                player = LogVideoPlayer(video_path, logs, original_logs, video_start_time, fps, title)
+                analysis = import_analysis_or_warn(path, self)
+                if analysis is None:
+                    return
+                video_path, logs, video_start_time, fps = analysis
+                player = LogVideoPlayer(video_path, logs, video_start_time, fps, title)
                 player.showMaximized()
 
 # ------------------- BARRA DE PROGRESO DE EXPORTACIÓN -------------------
 
+class ExportWorker(QThread):
+    """Corre export_analysis en segundo plano. Al terminar, error tiene el mensaje si falló y
+    cancelled indica si se cortó con requestInterruption."""
+
+    progress = Signal(int, str, str)  # porcentaje, paso, detalle (velocidad y ETA del reencode)
+
+    def __init__(self, player, out_path, window=None, parent=None):
+        super().__init__(parent)
+        self.player = player
+        self.out_path = out_path
+        self.window = window
+        self.error = None
+        self.cancelled = False
+
+    def run(self):
+        try:
+            export_analysis(self.player, self.out_path, self.progress.emit, self.isInterruptionRequested, self.window)
+        except ExportCancelled:
+            self.cancelled = True
+        except (OSError, RuntimeError, ValueError, zipfile.BadZipFile) as e:
+            self.error = str(e)
+
 class ExportProgressDialog(QDialog):
-    def __init__(self, parent=None):
+    """Avance de un ExportWorker. Cancel (o cerrar la ventana) corta el export; el diálogo queda
+    abierto hasta que el worker termina de limpiar."""
+
+    def __init__(self, worker, parent=None):
         super().__init__(parent)
+        self.worker = worker
         self.setWindowTitle("Exporting Lupi...")
-        self.setFixedSize(300, 120)
+        self.setFixedSize(340, 150)
 
         layout = QVBoxLayout(self)
 
@@ -899,16 +4406,47 @@ class ExportProgressDialog(QDialog):
         layout.addWidget(self.label)
 
         self.progress_bar = QProgressBar(self)
-        self.progress_bar.setRange(0, 4)  # 4 pasos
+        self.progress_bar.setRange(0, 100)
         layout.addWidget(self.progress_bar)
 
-    def update_step(self, step, message):
-        self.progress_bar.setValue(step)
+        self.detail_label = QLabel("", self)
+        self.detail_label.setAlignment(Qt.AlignCenter)
+        self.detail_label.setStyleSheet("color: gray")
+        layout.addWidget(self.detail_label)
+
+        self.cancel_btn = QPushButton("Cancel", self)
+        self.cancel_btn.clicked.connect(self.reject)
+        layout.addWidget(self.cancel_btn, alignment=Qt.AlignRight)
+
+        worker.progress.connect(self.update_progress)
+        worker.finished.connect(self.accept)
+
+    def update_progress(self, percent, message, detail):
+        if self.worker.isInterruptionRequested():
+            return
+        self.progress_bar.setValue(percent)
         self.label.setText(message)
-        QApplication.processEvents()
+        self.detail_label.setText(detail)
+
+    def reject(self):
+        if self.worker.isRunning():
+            self.worker.requestInterruption()
+            self.label.setText("Cancelling...")
+            self.detail_label.setText("")
+            self.cancel_btn.setEnabled(False)
+            return
+        super().reject()
+
+    def closeEvent(self, event):
+        if self.worker.isRunning():
+            self.reject()
+            event.ignore()
+            return
+        super().closeEvent(event)
 
 # ------------------- MAIN -------------------
 if __name__ == "__main__":
+    multiprocessing.freeze_support()
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(APPICON))
     qdarktheme.setup_theme()
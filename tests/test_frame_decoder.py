@@ -0,0 +1,38 @@
+"""Elección del decodificador de video ("video_decoder" en settings).
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import synclogs4
+
+
+class FfmpegAvailableTest(unittest.TestCase):
+
+    def check(self, filename):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "ffmpeg_binaries", "bin", "ffmpeg")
+            os.makedirs(os.path.dirname(path))
+            if filename:
+                open(os.path.join(os.path.dirname(path), filename), "wb").close()
+            with mock.patch.object(synclogs4, "FFMPEG_PATH", path):
+                return synclogs4.ffmpeg_available()
+
+    def test_windows_exe(self):
+        self.assertTrue(self.check("ffmpeg.exe"))
+
+    def test_plain_binary(self):
+        self.assertTrue(self.check("ffmpeg"))
+
+    def test_missing(self):
+        self.assertFalse(self.check(None))
+        self.assertFalse(self.check("ffprobe.exe"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+"""HighlightClassifier contra la comprobación por fila de siempre: regla en message.lower().
+
+Uso: python -m unittest discover tests
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import synclogs4
+
+RULES = [
+    {"name": "crash", "match": ["unhandled exception", "ÉRROR"]},
+    {"name": "net", "match": ["lognet"], "regex": [r"timeout \d+ms"]},
+    {"name": "accents", "regex": [r"ñandú \w+"]},
+]
+
+
+def expected_category(message):
+    lowered = message.lower()
+    for code, rule in enumerate(RULES, start=1):
+        if any(text.lower() in lowered for text in rule.get("match", [])):
+            return code
+        if any(re.search(pattern, message, re.IGNORECASE) for pattern in rule.get("regex", [])):
+            return code
+    return 0
+
+
+class HighlightRulesTest(unittest.TestCase):
+
+    def test_matches_per_row_lower(self):
+        rng = random.Random(2)
+        words = ["Unhandled Exception", "érror", "Érror", "ÉRROR", "erroR", "LogNet", "TIMEOUT 25ms",
+                 "Ñandú Grande", "ÑANDÚ x", "ñandú", "ß", "İstanbul", "ok", "[2026.10.16-12.00.00:000]"]
+        lines = []
+        for i in range(3000):
+            stamp = "[2026.10.16-12.00.%02d:%03d][  1]" % (i // 1000 % 60, i % 1000) if rng.random() < 0.8 else "  "
+            lines.append(stamp + " ".join(rng.choice(words) for _ in range(rng.randrange(4))))
+        fd, path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as f:
+            f.write("\n".join(lines))
+        self.addCleanup(os.remove, path)
+        logs = synclogs4.LogRecords(synclogs4.LogSource(path), synclogs4.HighlightClassifier(RULES))
+        for chunk in synclogs4.iter_log_chunks(logs.source, logs.classifier, workers=1):
+            logs.extend(chunk)
+        self.addCleanup(logs.source.close)
+        got = logs.categories.tolist()
+        expected = [expected_category(logs.message(row)) for row in range(len(logs))]
+        self.assertEqual(got, expected)
+        self.assertIn(1, got)
+        self.assertIn(3, got)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Compara el parseo de logs con el bucle regex + strptime original (el de antes de NumPy y mmap).
+
+Uso: python -m unittest discover tests
+"""
+import datetime
+import os
+import random
+import re
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import synclogs4
+
+
+def baseline_parse_logs(log_file):
+    """El parse_logs original, tal cual."""
+    logs = []
+    original_lines = []
+    pattern = re.compile(r"\[(\d{4}\.\d{2}\.\d{2})-(\d{2}\.\d{2}\.\d{2}):(\d+)\]")
+    with open(log_file, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            original_lines.append(line.rstrip("\n"))
+            match = pattern.search(line)
+            if match:
+                date_str = match.group(1).replace(".", "-")
+                time_str = match.group(2).replace(".", ":")
+                ms_str = match.group(3)
+                log_time = datetime.datetime.strptime(
+                    f"{date_str} {time_str}.{ms_str}",
+                    "%Y-%m-%d %H:%M:%S.%f"
+                )
+                logs.append((log_time, line.strip()))
+    return logs, original_lines
+
+
+def baseline_message(line):
+    # Lo que mostraba la tabla original
+    return re.sub(r"^\[\d{4}\.\d{2}\.\d{2}-\d{2}\.\d{2}\.\d{2}:\d+\]\s*", "", line)
+
+
+def random_log(rng, lines):
+    out = []
+    t = datetime.datetime(2024, 2, 28, 23, 59, 50)
+    for _ in range(lines):
+        t += datetime.timedelta(milliseconds=rng.randrange(0, 900))
+        ms = t.microsecond // 1000
+        kind = rng.random()
+        body = rng.choice(["LogTemp: Display: hello", "LogNet: Warning: ñandú ✓", "  Error: x\t",
+                           "LogInit: \xff\xfe bad utf-8", "", "]["])
+        if kind < 0.6:
+            stamp = f"[{t:%Y.%m.%d-%H.%M.%S}:{ms:03d}]"
+        elif kind < 0.7:
+            digits = rng.choice([1, 2, 6])
+            stamp = f"[{t:%Y.%m.%d-%H.%M.%S}:{t.microsecond:06d}"[:21 + digits] + "]"
+        elif kind < 0.8:
+            stamp = f"  noise [{t:%Y.%m.%d-%H.%M.%S}:{ms}] "  # timestamp fuera del inicio
+        else:
+            stamp = rng.choice(["    at Foo::Bar() line 12", "", "[2024.02.28-23.59]", "\t"])  # continuaciones
+        line = (stamp + f"[{rng.randrange(1000):3d}]" + body).encode("utf-8")
+        out.append(line.replace("\xff\xfe".encode("utf-8"), b"\xff\xfe"))
+    ending = rng.choice([b"\n", b"\r\n"])
+    return ending.join(out) + rng.choice([b"", ending])
+
+
+class LogParsingTest(unittest.TestCase):
+
+    def parse(self, data):
+        fd, path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        logs = synclogs4.LogRecords(synclogs4.LogSource(path), synclogs4.HIGHLIGHTER)
+        for chunk in synclogs4.iter_log_chunks(logs.source, logs.classifier, workers=1):
+            logs.extend(chunk)
+        self.addCleanup(logs.source.close)
+        return logs, baseline_parse_logs(path)
+
+    def test_matches_baseline(self):
+        rng = random.Random(1)
+        for _ in range(20):
+            logs, (expected, original_lines) = self.parse(random_log(rng, 500))
+            self.assertEqual(list(logs.source), original_lines)
+            self.assertEqual(len(logs), len(expected))
+            for row, (log_time, line) in enumerate(expected):
+                # Solo milisegundos: lo que sobra se trunca (ver test_sub_millisecond_truncated)
+                self.assertEqual(logs.times[row], synclogs4.datetime_to_ms(log_time))
+                self.assertEqual(logs.source.line(int(logs.line_nos[row])).strip(), line)
+                self.assertEqual(logs.message(row), baseline_message(line).strip())
+
+    def test_sub_millisecond_truncated(self):
+        # Cambio de comportamiento: el original guardaba microsegundos
+        logs, (expected, _) = self.parse(b"[2026.10.16-12.00.00:123456]a\n[2026.10.16-12.00.00:1234]b\n")
+        self.assertEqual([e[0].microsecond for e in expected], [123456, 123400])
+        self.assertEqual([synclogs4.ms_to_datetime(t).microsecond for t in logs.times], [123000, 123000])
+
+    def test_bare_cr_does_not_split(self):
+        # Cambio de comportamiento: el modo texto del original también cortaba líneas en un "\r" suelto
+        logs, (_, original_lines) = self.parse(b"[2026.10.16-12.00.00:001]a\rb\n")
+        self.assertEqual(original_lines, ["[2026.10.16-12.00.00:001]a", "b"])
+        self.assertEqual(list(logs.source), ["[2026.10.16-12.00.00:001]a\rb"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""SearchIndex: búsqueda por tokens, también mientras el log crece en modo follow.
+
+Uso: python -m unittest discover tests
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import synclogs4
+
+
+class SearchIndexTest(unittest.TestCase):
+
+    def open_log(self, data):
+        fd, path = tempfile.mkstemp(suffix=".log")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        logs = synclogs4.LogRecords(synclogs4.LogSource(path), synclogs4.HIGHLIGHTER)
+        for chunk in synclogs4.iter_log_chunks(logs.source, logs.classifier, workers=1):
+            logs.extend(chunk)
+        self.addCleanup(logs.source.close)
+        return path, logs
+
+    def follow(self, path, logs, data):
+        # Lo que hace LogTableModel.follow_source
+        with open(path, "ab") as f:
+            f.write(data)
+        partial = logs.source.has_partial_tail()
+        self.assertEqual(logs.source.refresh(), "grown")
+        if partial:
+            logs.drop_last_line()
+        source = logs.source
+        logs.extend(synclogs4.scan_log_chunk(source.data, int(source.offsets[-1]), len(source.data), logs.classifier))
+
+    def test_partial_last_line_reindexed(self):
+        path, logs = self.open_log(b"[2026.10.16-12.00.00:000]Log: start\n[2026.10.16-12.00.01:000]Log: hel")
+        index = synclogs4.SearchIndex()
+        index.update(logs)
+        self.assertEqual(index.query("hel", logs).tolist(), [1])
+        self.follow(path, logs, b"lo world\n")
+        self.assertTrue(index.behind(logs))
+        index.update(logs)
+        self.assertFalse(index.behind(logs))
+        self.assertEqual(index.query("hello", logs).tolist(), [1])
+        self.assertEqual(index.query("hel ", logs).tolist(), [])
+        self.assertEqual(index.query("lo ", logs).tolist(), [])
+        self.assertEqual(index.query("world", logs).tolist(), [1])
+        self.follow(path, logs, b"  hello again\n[2026.10.16-12.00.02:000]Log: bye")
+        index.update(logs)
+        self.assertEqual(index.query("hello", logs).tolist(), [1])
+        self.assertEqual(index.query("again", logs).tolist(), [1])
+        self.assertEqual(index.query("bye", logs).tolist(), [2])
+
+    def test_non_ascii_case_insensitive(self):
+        messages = ["Ñandú GRANDE", "ñandú chico", "ÉRROR fatal", "érror leve", "İstanbul", "ΟΔΟΣ",
+                    "ÁÉÍÓÚÑÜÁÉÍÓÚÑÜ_extra", "áéíóúñüáéíóúñü_EXTRA", "nandu"]
+        data = "".join("[2026.10.16-12.00.%02d:000]Log: %s\n" % (i, text) for i, text in enumerate(messages))
+        _, logs = self.open_log(data.encode("utf-8"))
+        index = synclogs4.SearchIndex()
+        index.update(logs)
+        self.assertEqual(index.query("ñandú ", logs).tolist(), [0, 1])
+        self.assertEqual(index.query("ÑANDÚ grande", logs).tolist(), [0])
+        self.assertEqual(index.query("Érror", logs).tolist(), [2, 3])
+        self.assertEqual(index.query("istanbul", logs).tolist(), [])
+        self.assertEqual(index.query("İSTANBUL", logs).tolist(), [4])
+        self.assertEqual(index.query("οδος", logs).tolist(), [5])
+        self.assertEqual(index.query("áéíóúñüáéíóúñü_extra ", logs).tolist(), [6, 7])
+        self.assertEqual(index.query("ÁÉÍÓÚÑÜÁÉÍÓÚÑÜ_ex", logs).tolist(), [6, 7])
+
+
+if __name__ == "__main__":
+    unittest.main()